@@ -7,12 +7,17 @@ import logging
 import signal
 import sys
 
-from os import path
-from flask import Flask
+from typing import Iterator
+
+from flask import Flask, Response, jsonify, request
 from waitress import serve
 
 from src import bot
+from src import log_reader
 from src import logger
+from src.command.command_queue import command_queue
+from src.metrics import registry
+from src.parser.response_cache import response_cache
 
 app = Flask(__name__)
 
@@ -20,16 +25,54 @@ app = Flask(__name__)
 log = logging.getLogger('werkzeug')
 log.setLevel(logging.ERROR)
 
+# The number of seconds between keep-alive comments on the log stream
+STREAM_KEEPALIVE : float = 15
+
 @app.route("/", methods=["GET"])
 def home():
     """
-    Front-end of the web application.
+    Front-end of the web application. Shows the end of the log, optionally filtered by level
+    or game ID. The lines and offset parameters select a page of lines counted back from the end.
+    """
+    lines = log_reader.tail(logger.LOG_FILE,
+                            lines=request.args.get("lines", log_reader.DEFAULT_LINES, type=int),
+                            offset=request.args.get("offset", 0, type=int),
+                            level=request.args.get("level"),
+                            game=request.args.get("game"))
+    return "<xmp>" + "\n".join(lines) + "</xmp>"
+
+@app.route("/stream", methods=["GET"])
+def stream():
+    """
+    Stream the log as it is written, using server-sent events. The most recent lines are sent
+    first. A comment is sent when no line has been logged for a while, so that a disconnected
+    client is noticed, and when lines were dropped because the client fell behind.
     """
-    if not path.exists ("bot.log"):
-        return ""
+    subscription = logger.log.subscribe()
+    if subscription is None:
+        return "Too many log subscribers", 503
+
+    def events() -> Iterator[str]:
+        reported : int = 0
+        try:
+            for line in subscription.backlog:
+                yield to_event(line)
+            while True:
+                line = subscription.get(STREAM_KEEPALIVE)
+                if subscription.dropped > reported:
+                    yield ": dropped " + str(subscription.dropped - reported) + " lines\n\n"
+                    reported = subscription.dropped
+                yield ": keep-alive\n\n" if line is None else to_event(line)
+        finally:
+            logger.log.unsubscribe(subscription)
 
-    with open("bot.log", encoding="utf-8") as log_file:
-        return "<xmp>" + log_file.read() + "</xmp>"
+    return Response(events(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+def to_event(line : str) -> str:
+    """
+    Return the given log line as a server-sent event.
+    """
+    return "".join("data: " + part + "\n" for part in line.split("\n")) + "\n"
 
 @app.route('/health')
 def health():
@@ -40,11 +83,26 @@ def health():
         return "Health check failed", 503
     return "Healthy", 200
 
+@app.route('/stats')
+def stats():
+    """
+    Command queue and response cache statistics endpoint.
+    """
+    return jsonify({**command_queue.stats(), "response_cache": response_cache.stats()})
+
+@app.route('/metrics')
+def metrics():
+    """
+    Prometheus metrics endpoint.
+    """
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
 def shutdown(_signum, _frame):
     """
     Shutdown the bot and the web application.
     """
     logger.log.info("Shutting down...")
+    logger.log.stop()
     sys.exit(0)
 
 signal.signal(signal.SIGTERM, shutdown)
@@ -56,4 +114,5 @@ if __name__ == '__main__':
     bot_thread.start()
 
     # Run the front-end web application
-    serve(app, host="0.0.0.0", port=5000, _quiet=True)
+    # Log streams each hold a thread, so leave enough for the health check and other requests
+    serve(app, host="0.0.0.0", port=5000, threads=8, _quiet=True)
@@ -2,6 +2,8 @@
 This module handles the main logic to check for game updates.
 """
 
+import asyncio
+
 from datetime import datetime, timedelta
 from threading import Thread
 from typing import List, Optional
@@ -11,12 +13,16 @@ from src import schedule
 from src.command.command_queue import command_queue
 from src.command.check_game_status import CheckGameStatus
 from src.command.check_health import CheckHealth
-from src.game_thread import GameThread
+from src.command.journal import command_journal
+from src.game_data_registry import game_data_registry
+from src.game_tracker import GameTracker, fetch_pool
 from src.logger import log
 from src.output import output
-from src.thread_list import ThreadList
+from src.output.video_cache import video_cache
+from src.parser.response_cache import response_cache
+from src.tracker_list import TrackerList
 
-threads : ThreadList = ThreadList()
+trackers : TrackerList = TrackerList()
 
 def wait_until_morning() -> None:
     """
@@ -30,14 +36,35 @@ def wait_until_morning() -> None:
     pause.until(morning)
 
 
-def check_game_status() -> None:
+async def check_game_status() -> None:
+    """
+    Enqueue a game status check command every thirty seconds.
+    """
+    while not trackers.is_empty():
+        command_queue.enqueue(CheckGameStatus(trackers.get()))
+        await asyncio.sleep(30)
+    log.info("Exiting status check")
+
+
+async def track_games(games : List[GameTracker]) -> None:
+    """
+    Track each of the given games, along with the periodic status check, on a single event loop.
+    A tracker that fails is logged and doesn't stop the others.
+    """
+    fetch_pool.resize(len(games))
+    results = await asyncio.gather(check_game_status(),
+                                   *(game.run() for game in games),
+                                   return_exceptions=True)
+    for task, result in zip(["Status check", *(str(game) for game in games)], results):
+        if isinstance(result, BaseException):
+            log.error(task + " failed: " + repr(result))
+
+
+def run_trackers(games : List[GameTracker]) -> None:
     """
-    Enqueue a parse command every five seconds.
+    Run the event loop that tracks the given games until every tracker has finished.
     """
-    while not threads.is_empty():
-        command_queue.enqueue(CheckGameStatus(threads.get()))
-        pause.seconds(30)
-    log.info("Exiting status thread")
+    asyncio.run(track_games(games))
 
 
 def check_health() -> bool:
@@ -64,26 +91,32 @@ def check_for_updates() -> None:
 
         games : Optional[List[int]] = schedule.get_todays_games()
 
-        # Create a thread for each of today's games
+        # Create a tracker for each of today's games
         if games:
-            for game in games:
-                threads.append(GameThread(game))
 
-            # Start all threads
-            for thread in threads.get():
-                thread.start()
+            # Resume any commands that hadn't finished when the bot last stopped
+            for command in command_journal.open():
+                command_queue.enqueue(command)
+
+            for game in games:
+                trackers.append(GameTracker(game))
 
-            # Perform a periodic check to determine if the game threads have finished
-            status_thread : Thread = Thread(target=check_game_status)
-            status_thread.start()
+            # Track all games, and periodically check whether they have finished, on a single
+            # event loop running in the background
+            tracker_thread : Thread = Thread(target=run_trackers, args=(trackers.get(),))
+            tracker_thread.start()
 
             # Start the command server. This call will block until the shutdown command is executed.
             command_queue.start()
 
             # Stop checking the status of games
-            threads.clear()
+            trackers.clear()
+            tracker_thread.join()
+            game_data_registry.clear()
+            response_cache.clear()
+            command_journal.clear()
+            video_cache.clear()
             output.clear_posts()
-            status_thread.join()
             log.info("All games are finished for the day. Pausing until tomorrow.")
 
         else:
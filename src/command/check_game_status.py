@@ -6,7 +6,7 @@ from typing import List
 
 from src.command.command import Command, Priority
 from src.command.command_queue import command_queue
-from src.game_thread import GameThread
+from src.game_tracker import GameTracker
 
 # pylint: disable=too-few-public-methods
 class CheckGameStatus(Command):
@@ -14,17 +14,21 @@ class CheckGameStatus(Command):
     This class defines the Post Highlight command.
     """
 
-    def __init__(self, threads : List[GameThread]):
-        super().__init__("Check Game Status", Priority.NORMAL)
-        self.threads : List[GameThread] = threads
+    # A new status check is enqueued every thirty seconds, so stale checks can be dropped
+    max_age = 60
+    timeout = 2 * 60
+
+    def __init__(self, trackers : List[GameTracker]):
+        super().__init__("Check Game Status", Priority.HOUSEKEEPING)
+        self.trackers : List[GameTracker] = trackers
 
 
     def execute(self) -> None:
         """
         Execute the command.
         """
-        if len(self.threads) > 0:
-            for thread in self.threads:
-                if not thread.is_game_over():
+        if len(self.trackers) > 0:
+            for tracker in self.trackers:
+                if not tracker.is_game_over():
                     return
             command_queue.stop()
@@ -13,8 +13,11 @@ class CheckHealth(Command):
     This class defines the Post Highlight command.
     """
 
+    # Nobody is waiting on a health check after a few seconds
+    max_age = 5
+
     def __init__(self):
-        super().__init__("Check Health", Priority.HIGH)
+        super().__init__("Check Health", Priority.HEALTH, pool="health")
         self._event = threading.Event()
 
 
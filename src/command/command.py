@@ -2,26 +2,68 @@
 This module defines the Command interface.
 """
 
+import time
+
 from abc import ABC, abstractmethod
 from enum import Enum
+from threading import Event
+from typing import Any, Dict, Optional, Type
 
 
 class Priority(Enum):
     """
-    The priority of the Command.
+    The priority of the Command. Commands with a lower value are executed first. A post is
+    executed before any reply, since a reply cannot be sent until the post it replies to exists.
     """
-    HIGH   = 1
-    NORMAL = 2
+    HEALTH       = 1
+    POST         = 2
+    REPLY        = 3
+    HOUSEKEEPING = 4
+
+
+# Every Command subclass, by class name, so that journaled commands can be restored
+command_types : Dict[str, Type['Command']] = {}
 
 
+# pylint: disable=too-many-instance-attributes
 class Command(ABC):
     """
     The Command interface defines the method for executing the command.
+
+    Each command names the worker pool it is executed on, so that slow commands don't hold up
+    unrelated ones. A command with no pool is executed directly by the thread processing the
+    queue. Commands that share an ordering key are executed one at a time, in the order they
+    were dispatched, even when they run on different pools.
+
+    A command that hasn't started within max_age seconds of being created is dropped, and a
+    command that runs for longer than timeout seconds is abandoned. Cancellation is cooperative:
+    a long-running command can check is_cancelled() to stop early.
+
+    A command that returns a record from to_record() is written to the command journal, if one
+    is enabled, and is restored with from_record() if the bot restarts before it has finished.
     """
 
-    def __init__(self, name : str, priority : Priority):
-        self.name     : str      = name
-        self.priority : Priority = priority
+    max_age : Optional[float] = None
+    timeout : Optional[float] = None
+
+    def __init__(self,
+                 name : str,
+                 priority : Priority,
+                 pool : Optional[str] = "default",
+                 ordering_key : Optional[str] = None):
+        self.name         : str           = name
+        self.priority     : Priority      = priority
+        self.pool         : Optional[str] = pool
+        self.ordering_key : Optional[str] = ordering_key
+        self.created_at   : float           = time.monotonic()
+        self.enqueued_at  : Optional[float] = None
+        self.started_at   : Optional[float] = None
+        self.cancelled    : Event           = Event()
+
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        command_types[cls.__name__] = cls
 
 
     def __str__(self) -> str:
@@ -35,5 +77,74 @@ class Command(ABC):
         """
 
 
+    def is_expired(self) -> bool:
+        """
+        Return a boolean indicating whether or not the command is too old to be started.
+        """
+        return self.max_age is not None and time.monotonic() - self.created_at > self.max_age
+
+
+    def is_overdue(self) -> bool:
+        """
+        Return a boolean indicating whether or not the command has been running for longer than
+        its timeout.
+        """
+        return (self.timeout is not None and
+                self.started_at is not None and
+                time.monotonic() - self.started_at > self.timeout)
+
+
+    def get_coalescing_key(self) -> Optional[str]:
+        """
+        Return the key used to coalesce this command with pending commands. When a command is
+        enqueued while an older command with the same key is still waiting to start, the older
+        command is merged into the newer one and cancelled. Commands with no key are never
+        coalesced.
+        """
+        return None
+
+
+    def merge(self, older : 'Command') -> None:
+        """
+        Merge an older, pending command with the same coalescing key into this command.
+        """
+
+
+    def to_record(self) -> Optional[Dict[str, Any]]:
+        """
+        Return a JSON-serializable record from which the command can be restored after a restart,
+        or None if the command isn't worth restoring.
+        """
+        return None
+
+
+    @classmethod
+    def from_record(cls, record : Dict[str, Any]) -> Optional['Command']:
+        """
+        Restore a command from a record created by to_record, or return None if it can't be
+        restored.
+        """
+        # pylint: disable=unused-argument
+        return None
+
+
+    def cancel(self) -> None:
+        """
+        Request that the command be cancelled.
+        """
+        self.cancelled.set()
+
+
+    def is_cancelled(self) -> bool:
+        """
+        Return a boolean indicating whether or not the command has been cancelled.
+        """
+        return self.cancelled.is_set()
+
+
     def __lt__(self, other) -> bool:
-        return self.priority == Priority.NORMAL and other.priority != Priority.NORMAL
+        """
+        Return a boolean indicating whether or not this command should be executed before the
+        other command.
+        """
+        return self.priority.value < other.priority.value
@@ -2,12 +2,32 @@
 This module defines the command queue class.
 """
 
+import heapq
+import itertools
+import time
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
-from typing import Optional, List
+from threading import Condition
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 
 from src.command.command import Command, Priority
+from src.command.journal import Journal, command_journal
 from src.logger import log
+from src.metrics import Callback, Counter, CounterCallback, Histogram, registry
+
+# The number of worker threads in each pool. Media posts can take minutes to download and upload,
+# so they get their own workers to keep them from delaying replies and health checks.
+POOL_SIZES : Dict[str, int] = {
+    "health":  1,
+    "media":   2,
+    "text":    1,
+    "default": 1,
+}
 
+# The number of seconds between checks for commands that have exceeded their timeout
+WATCHDOG_INTERVAL : float = 1.0
 
 class State(Enum):
     """
@@ -29,65 +49,340 @@ class Shutdown(Command):
     The command used to stop the command queue.
     """
     def __init__(self):
-        super().__init__("Shutdown", Priority.NORMAL)
+        super().__init__("Shutdown", Priority.HOUSEKEEPING, pool=None)
 
     def execute(self) -> None:
         raise ShutdownException()
 
 
+# pylint: disable=too-many-instance-attributes
 class CommandQueue:
     """
-    The Command Queue is responsible for executing the commands that are enqueued.
+    The Command Queue is responsible for executing the commands that are enqueued. Commands may
+    be enqueued from any thread. The thread processing the queue sleeps until a command arrives.
+
+    The queue is a heap ordered by priority and then by a sequence number, so commands with the
+    same priority are dispatched in the order they were enqueued. Each command is dispatched to
+    the worker pool it names.
+
+    A command that shares its coalescing key with an older command that hasn't started yet
+    replaces that command, so only the latest state is acted on.
+
+    Commands that are past their maximum age when they are dispatched or started are dropped.
+    Commands that exceed their timeout are cancelled and abandoned: the queue stops waiting for
+    them, and their pool is replaced so the stuck worker doesn't reduce its capacity.
+
+    The queue records how long each type of command waits between being enqueued and starting,
+    how long it runs for, and how often it fails. These are reported by stats(), along with the
+    current depth of the queue.
+
+    If a journal is given, commands are recorded in it when they are enqueued and when they
+    finish, so that unfinished commands can be restored after a restart.
     """
 
-    def __init__(self) -> None:
-        self.queue : List  = []
-        self.state : State = State.STOPPED
+    def __init__(self,
+                 pool_sizes : Optional[Dict[str, int]] = None,
+                 journal : Optional[Journal] = None) -> None:
+        self.queue      : List[Tuple[int, int, Command]] = []
+        self.sequence   : Iterator[int]                  = itertools.count()
+        self.state      : State                          = State.STOPPED
+        self.condition  : Condition                      = Condition()
+        self.pool_sizes : Dict[str, int]                 = pool_sizes or POOL_SIZES
+        self.journal    : Optional[Journal]              = journal
+        self.pools      : Dict[str, ThreadPoolExecutor]  = {}
+        self.waiting    : Dict[str, Deque[Command]]      = {}
+        self.running    : Dict[Future, Command]          = {}
+        self.pending    : Dict[str, Command]             = {}
+        self.coalesced  : int                            = 0
+        self.expired    : int                            = 0
+        self.timed_out  : int                            = 0
+        self.wait_time  : Histogram = Histogram("command_wait_seconds",
+                                                "Time commands wait before they start.",
+                                                "command")
+        self.run_time   : Histogram = Histogram("command_run_seconds",
+                                                "Time commands take to execute.",
+                                                "command")
+        self.failures   : Counter   = Counter("command_failures_total",
+                                              "Commands that raised an exception.",
+                                              "command")
 
 
     def enqueue(self, command : Command):
         """
-        Enqueue the given Command in the command queue.
+        Enqueue the given Command in the command queue. The command is recorded in the journal
+        after it has been merged with any older command, so that a restored command includes
+        the changes it replaced.
         """
-        for index, item in enumerate(self.queue):
-            if command > item:
-                self.queue.insert(index, command)
-                return
-        self.queue.append(command)
+        command.enqueued_at = time.monotonic()
+        with self.condition:
+            self.coalesce(command)
+            if self.journal is not None:
+                self.journal.record_enqueued(command)
+            heapq.heappush(self.queue, (command.priority.value, next(self.sequence), command))
+            self.condition.notify()
 
 
-    def dequeue(self) -> Optional[Command]:
+    def coalesce(self, command : Command) -> None:
         """
-        Dequeue the first element from the command queue.
+        Merge the given command with any older command with the same coalescing key that hasn't
+        started yet, and cancel the older command. The lock must be held.
         """
-        if not self.empty():
-            return self.queue.pop(0)
-        return None
+        key : Optional[str] = command.get_coalescing_key()
+        if key is None:
+            return
+        older : Optional[Command] = self.pending.get(key)
+        if older is not None and older.started_at is None and not older.is_cancelled():
+            log.info("Coalescing " + str(older) + " into a newer command: " + key)
+            command.merge(older)
+            older.cancel()
+            self.coalesced += 1
+        self.pending[key] = command
+
+
+    def dequeue(self, block : bool = False, timeout : Optional[float] = None) -> Optional[Command]:
+        """
+        Dequeue the first element from the command queue. If block is set, wait until a command is
+        available or the timeout expires.
+        """
+        with self.condition:
+            if block:
+                self.condition.wait_for(lambda: len(self.queue) > 0, timeout)
+            if self.queue:
+                return heapq.heappop(self.queue)[2]
+            return None
 
 
     def empty(self) -> bool:
         """
         Return a boolean indicating whether or not the queue is empty.
         """
-        return not self.queue
+        with self.condition:
+            return not self.queue
+
+
+    def get_pool(self, name : str) -> ThreadPoolExecutor:
+        """
+        Return the worker pool with the given name, creating it if necessary.
+        """
+        if name not in self.pools:
+            self.pools[name] = ThreadPoolExecutor(max_workers=self.pool_sizes.get(name, 1),
+                                                  thread_name_prefix="command-" + name)
+        return self.pools[name]
+
+
+    def dispatch(self, command : Command) -> None:
+        """
+        Submit the given command to its worker pool. If an earlier command with the same ordering
+        key has not finished, this command is held back and submitted once that command is done.
+        """
+        with self.condition:
+            key : Optional[str] = command.ordering_key
+            if key is not None:
+                if key in self.waiting:
+                    self.waiting[key].append(command)
+                    return
+                self.waiting[key] = deque()
+            self.submit(command)
+
+
+    def submit(self, command : Command) -> None:
+        """
+        Submit the given command to its worker pool. The lock must be held.
+        """
+        pool : ThreadPoolExecutor = self.get_pool(command.pool or "default")
+        job  : Future             = pool.submit(self.run, command)
+        self.running[job] = command
+        job.add_done_callback(lambda done: self.finish(command, done))
+
+
+    def drop_expired(self, command : Command) -> bool:
+        """
+        Return a boolean indicating whether or not the given command has expired, recording it
+        as dropped if so.
+        """
+        if not command.is_expired():
+            return False
+        log.warning("Dropping expired command: " + str(command))
+        with self.condition:
+            self.expired += 1
+            self.forget(command)
+        return True
+
+
+    def begin(self, command : Command) -> bool:
+        """
+        Mark the given command as started, unless it has been cancelled or has expired. Return a
+        boolean indicating whether or not the command should be executed.
+        """
+        with self.condition:
+            if command.is_cancelled() or self.drop_expired(command):
+                return False
+            command.started_at = time.monotonic()
+            self.forget(command)
+        if command.enqueued_at is not None:
+            self.wait_time.observe(command.name, command.started_at - command.enqueued_at)
+        return True
+
+
+    def forget(self, command : Command) -> None:
+        """
+        Stop tracking the given command as pending, so that newer commands won't be coalesced with
+        it. The lock must be held.
+        """
+        key : Optional[str] = command.get_coalescing_key()
+        if key is not None and self.pending.get(key) is command:
+            del self.pending[key]
+
+
+    def run(self, command : Command) -> None:
+        """
+        Execute the given command on a worker thread.
+        """
+        try:
+            if self.begin(command):
+                command.execute()
+        except Exception as error: # pylint: disable=broad-exception-caught
+            log.error("Command failed: " + str(command) + ": " + str(error))
+            self.failures.inc(command.name)
+        finally:
+            if command.started_at is not None:
+                self.run_time.observe(command.name, time.monotonic() - command.started_at)
+            self.record_finished(command)
+
+
+    def record_finished(self, command : Command) -> None:
+        """
+        Record in the journal that the given command has finished, or will never run.
+        """
+        if self.journal is not None:
+            self.journal.record_finished(command)
+
+
+    def finish(self, command : Command, job : Future) -> None:
+        """
+        Remove a finished job from the outstanding jobs, and submit the next command that shares
+        its ordering key. Jobs that were abandoned have already been removed, and jobs that were
+        cancelled have been moved to another pool.
+        """
+        with self.condition:
+            if job not in self.running or job.cancelled():
+                return
+            del self.running[job]
+            key : Optional[str] = command.ordering_key
+            if key is not None:
+                if self.waiting[key]:
+                    self.submit(self.waiting[key].popleft())
+                else:
+                    del self.waiting[key]
+            self.condition.notify_all()
+
+
+    def check_timeouts(self) -> None:
+        """
+        Cancel and abandon any commands that have exceeded their timeout. A worker thread can't be
+        interrupted, so the pool is replaced with a new one and the stuck worker is left behind.
+        Commands that were submitted to the old pool but haven't started are moved to the new
+        pool, so they don't wait behind the stuck worker.
+        """
+        with self.condition:
+            overdue = [(job, command) for job, command in self.running.items()
+                       if command.is_overdue()]
+            for job, command in overdue:
+                log.error("Abandoning command that exceeded its timeout: " + str(command))
+                command.cancel()
+                self.record_finished(command)
+                self.timed_out += 1
+                name : str = command.pool or "default"
+                if name in self.pools:
+                    pool : ThreadPoolExecutor = self.pools.pop(name)
+                    queued = [(other, queued_command)
+                              for other, queued_command in self.running.items()
+                              if (queued_command.pool or "default") == name]
+                    for other, queued_command in queued:
+                        if other.cancel():
+                            del self.running[other]
+                            self.submit(queued_command)
+                    pool.shutdown(wait=False)
+                self.finish(command, job)
+
+
+    def is_idle(self) -> bool:
+        """
+        Return a boolean indicating whether or not every dispatched command has finished. The lock
+        must be held.
+        """
+        return not self.running and not self.waiting
+
+
+    def get_depth(self) -> Dict[str, int]:
+        """
+        Return the number of commands waiting to be dispatched at each priority.
+        """
+        with self.condition:
+            depth : Dict[str, int] = {priority.name: 0 for priority in Priority}
+            for _, _, command in self.queue:
+                if not command.is_cancelled():
+                    depth[command.priority.name] += 1
+            return depth
+
+
+    def get_in_progress(self) -> Dict[str, int]:
+        """
+        Return the number of commands held back behind an earlier command with the same ordering
+        key, and the number that are running.
+        """
+        with self.condition:
+            return {"held":    sum(len(commands) for commands in self.waiting.values()),
+                    "running": len(self.running)}
+
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the statistics for the queue: the number of commands waiting at each priority, the
+        number held back behind an earlier command with the same ordering key, the number
+        running, and the wait time, run time and failures for each type of command.
+        """
+        return {
+            "depth":     self.get_depth(),
+            **self.get_in_progress(),
+            "coalesced": self.coalesced,
+            "expired":   self.expired,
+            "timed_out": self.timed_out,
+            "failures":  self.failures.snapshot(),
+            "wait_time": self.wait_time.snapshot(),
+            "run_time":  self.run_time.snapshot()
+        }
 
 
     def start(self) -> None:
         """
-        Start processing commands from the queue.
+        Start processing commands from the queue. This call blocks until the queue is stopped.
+        Commands that were dispatched before the queue was stopped are allowed to finish.
         """
         self.state = State.RUNNING
         while True:
-            if not self.empty():
-                try:
-                    command : Optional[Command] = self.dequeue()
-                    if command is not None:
-                        command.execute()
-                except ShutdownException:
-                    log.info("Stopping the command server.")
-                    self.state = State.STOPPED
-                    self.queue = []
-                    break
+            try:
+                command : Optional[Command] = self.dequeue(block=True, timeout=WATCHDOG_INTERVAL)
+                self.check_timeouts()
+                if command is None:
+                    continue
+                if command.is_cancelled() or self.drop_expired(command):
+                    self.record_finished(command)
+                    continue
+                if command.pool is None:
+                    command.execute()
+                else:
+                    self.dispatch(command)
+            except ShutdownException:
+                log.info("Stopping the command server.")
+                with self.condition:
+                    self.queue   = []
+                    self.pending = {}
+                    while not self.is_idle():
+                        self.condition.wait(WATCHDOG_INTERVAL)
+                        self.check_timeouts()
+                self.state = State.STOPPED
+                break
 
 
     def stop(self) -> None:
@@ -98,4 +393,28 @@ class CommandQueue:
         self.enqueue(Shutdown())
 
 
-command_queue = CommandQueue()
+def register_metrics(queue : CommandQueue) -> None:
+    """
+    Register the metrics for the given queue, so they are exported by the application.
+    """
+    registry.register(queue.wait_time)
+    registry.register(queue.run_time)
+    registry.register(queue.failures)
+    registry.register(Callback("command_queue_depth",
+                               "Commands waiting to be dispatched.",
+                               "priority",
+                               queue.get_depth))
+    registry.register(Callback("command_queue_in_progress",
+                               "Commands that have been dispatched and haven't finished.",
+                               "state",
+                               queue.get_in_progress))
+    registry.register(CounterCallback("command_dropped_total",
+                                      "Commands that were dropped before they finished.",
+                                      "reason",
+                                      lambda: {"coalesced": queue.coalesced,
+                                               "expired":   queue.expired,
+                                               "timed_out": queue.timed_out}))
+
+
+command_queue = CommandQueue(journal=command_journal)
+register_metrics(command_queue)
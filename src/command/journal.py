@@ -0,0 +1,270 @@
+"""
+This module defines the command journal.
+"""
+
+import itertools
+import json
+import os
+import time
+
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from src.command.command import Command, command_types
+from src.data.game_data import GameData
+from src.data.highlight import Highlight, load_highlight
+from src.game_data_registry import game_data_registry
+from src.logger import log
+
+# The path of the journal file. The journal is disabled when no path is configured.
+JOURNAL_PATH : str = os.getenv("COMMAND_JOURNAL", "")
+
+# The number of records appended to the journal before it is compacted
+COMPACT_THRESHOLD : int = 1000
+
+
+# pylint: disable=too-many-instance-attributes
+class Journal:
+    """
+    This class defines an append-only journal of the commands in the command queue. Each
+    enqueued command that can be restored is recorded, along with the completion of that command
+    and the latest state of each highlight that has been processed. Every record is flushed to
+    disk before the call returns, so a restart can resume the commands that hadn't finished and
+    recognize the highlights that were already posted without searching the posts made today.
+
+    The journal is compacted when it is opened and whenever enough records have been appended,
+    by rewriting it with only the unfinished commands and the latest state of each highlight.
+    """
+
+    def __init__(self, path : str) -> None:
+        self.path        : str                       = path
+        self.lock        : Lock                      = Lock()
+        self.file        : Optional[TextIO]          = None
+        self.sequence    : Iterator[int]             = itertools.count()
+        self.ids         : Dict[Command, int]        = {}
+        self.outstanding : Dict[int, Dict[str, Any]] = {}
+        self.highlights  : Dict[int, Dict[str, Any]] = {}
+        self.post_ids    : Dict[int, Dict[str, Optional[Dict[str, str]]]] = {}
+        self.appended    : int                       = 0
+
+
+    def is_enabled(self) -> bool:
+        """
+        Return a boolean indicating whether or not the journal is enabled.
+        """
+        return self.path != ""
+
+
+    def open(self) -> List[Command]:
+        """
+        Load and compact the journal, and return the commands that hadn't finished. The returned
+        commands are already recorded, so they can be enqueued without being recorded again.
+        """
+        if not self.is_enabled():
+            return []
+
+        with self.lock:
+            self.close_file()
+            self.load()
+            self.compact()
+
+        commands : List[Command] = []
+        for command_id, record in list(self.outstanding.items()):
+            command : Optional[Command] = self.restore(record)
+            with self.lock:
+                if command is None:
+                    log.error("Could not restore journaled command: " + str(record))
+                    self.append({"op": "done", "id": command_id})
+                else:
+                    self.ids[command] = command_id
+                    commands.append(command)
+
+        log.info("Restored " + str(len(commands)) + " commands from the journal.")
+        return commands
+
+
+    def load(self) -> None:
+        """
+        Read the records in the journal. A record that was only partially written when the bot
+        stopped is ignored. The lock must be held.
+        """
+        self.outstanding = {}
+        self.highlights  = {}
+        self.post_ids    = {}
+        last_id : int    = -1
+
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        record : Dict[str, Any] = json.loads(line)
+                    except json.JSONDecodeError:
+                        log.warning("Skipping incomplete journal record: " + line.strip())
+                        continue
+                    last_id = max(last_id, record.get("id", -1))
+                    self.apply(record)
+
+        self.sequence = itertools.count(last_id + 1)
+
+
+    def apply(self, record : Dict[str, Any]) -> None:
+        """
+        Apply a single record to the state of the journal. The lock must be held.
+        """
+        if record["op"] == "enqueue":
+            self.outstanding[record["id"]] = record
+        elif record["op"] == "done":
+            self.outstanding.pop(record["id"], None)
+        elif record["op"] == "highlight":
+            data         : Dict[str, Any] = record["data"]
+            highlight_id : int            = int(data["goal"]["highlightClip"])
+            previous     : Dict[str, Any] = self.highlights.get(highlight_id, {})
+            if not data.get("post_id") and previous.get("post_id"):
+                data["post_id"] = previous["post_id"]
+            self.highlights[highlight_id] = data
+
+
+    def compact(self) -> None:
+        """
+        Rewrite the journal with only the unfinished commands and the latest state of each
+        highlight. The new journal is written to a temporary file and moved into place, so a
+        crash part way through leaves the old journal intact. The lock must be held.
+        """
+        self.close_file()
+        temporary : str = self.path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as journal:
+            for data in self.highlights.values():
+                journal.write(json.dumps({"op": "highlight", "data": data}) + "\n")
+            for record in self.outstanding.values():
+                journal.write(json.dumps(record) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(temporary, self.path)
+        self.appended = 0
+
+
+    def append(self, record : Dict[str, Any]) -> None:
+        """
+        Append a record to the journal and flush it to disk, compacting the journal if enough
+        records have been appended since it was last compacted. The lock must be held.
+        """
+        self.apply(record)
+        if self.file is None:
+            self.file = open(self.path, "a", encoding="utf-8") # pylint: disable=consider-using-with
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.appended += 1
+        if self.appended >= COMPACT_THRESHOLD:
+            self.compact()
+
+
+    def restore(self, record : Dict[str, Any]) -> Optional[Command]:
+        """
+        Restore the command in the given enqueue record, keeping its original age.
+        """
+        command_type = command_types.get(record["type"])
+        if command_type is None:
+            return None
+        try:
+            command : Optional[Command] = command_type.from_record(record["data"])
+        except (KeyError, TypeError, ValueError) as error:
+            log.error("Invalid journaled command: " + str(error))
+            return None
+        if command is not None:
+            command.created_at = time.monotonic() - max(time.time() - record["time"], 0)
+        return command
+
+
+    def restore_highlight(self, highlight_id : int) -> Optional[Highlight]:
+        """
+        Restore the latest state of the highlight with the given ID, or return None if the
+        highlight isn't in the journal. Restored versions of a highlight share the IDs of its
+        post, so that a reply sends once the post has been sent.
+        """
+        with self.lock:
+            record : Optional[Dict[str, Any]] = self.highlights.get(highlight_id)
+        if record is None:
+            return None
+        return self.load_highlight(record)
+
+
+    def load_highlight(self, record : Dict[str, Any]) -> Highlight:
+        """
+        Restore a highlight from the given record, sharing the IDs of its post with every other
+        restored version of the same highlight.
+        """
+        game_data : Optional[GameData] = game_data_registry.get(record["game_id"])
+        highlight : Highlight          = load_highlight(record, game_data)
+        with self.lock:
+            highlight.post_id = self.post_ids.setdefault(highlight.id, highlight.post_id)
+        return highlight
+
+
+    def record_enqueued(self, command : Command) -> None:
+        """
+        Record that the given command was enqueued, if it can be restored.
+        """
+        if not self.is_enabled():
+            return
+        data : Optional[Dict[str, Any]] = command.to_record()
+        if data is None:
+            return
+        with self.lock:
+            if command in self.ids:
+                return
+            command_id : int = next(self.sequence)
+            self.ids[command] = command_id
+            self.append({"op":   "enqueue",
+                         "id":   command_id,
+                         "type": type(command).__name__,
+                         "time": time.time(),
+                         "data": data})
+
+
+    def record_finished(self, command : Command) -> None:
+        """
+        Record that the given command has finished, or will never run.
+        """
+        if not self.is_enabled():
+            return
+        with self.lock:
+            command_id : Optional[int] = self.ids.pop(command, None)
+            if command_id is not None:
+                self.append({"op": "done", "id": command_id})
+
+
+    def record_highlight(self, highlight : Highlight) -> None:
+        """
+        Record the latest state of the given highlight.
+        """
+        if not self.is_enabled():
+            return
+        with self.lock:
+            self.append({"op": "highlight", "data": highlight.to_record()})
+
+
+    def close_file(self) -> None:
+        """
+        Close the journal file, if it is open. The lock must be held.
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+    def clear(self) -> None:
+        """
+        Clear the journal. This is done at the end of the day, once every game has finished.
+        """
+        if not self.is_enabled():
+            return
+        with self.lock:
+            self.ids         = {}
+            self.outstanding = {}
+            self.highlights  = {}
+            self.post_ids    = {}
+            self.compact()
+
+
+command_journal = Journal(JOURNAL_PATH)
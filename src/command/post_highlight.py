@@ -2,9 +2,10 @@
 This module defines the Post Highlight command.
 """
 
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from src.command.command import Command, Priority
+from src.command.journal import command_journal
 from src.data.highlight import Highlight
 from src.logger import log
 from src.output import output
@@ -15,9 +16,32 @@ class PostHighlight(Command):
     This class defines the Post Highlight command.
     """
 
+    # A goal post that can't be sent within fifteen minutes is no longer worth sending, and the
+    # download and upload of the video shouldn't take longer than ten.
+    max_age = 15 * 60
+    timeout = 10 * 60
+
     def __init__(self, highlight : Highlight):
         self.highlight : Highlight = highlight
-        super().__init__("Post Highlight", Priority.NORMAL)
+        super().__init__("Post Highlight",
+                         Priority.POST,
+                         pool="media",
+                         ordering_key="highlight-" + str(highlight.id))
+
+
+    def to_record(self) -> Optional[Dict[str, Any]]:
+        """
+        Return a record of the highlight to post.
+        """
+        return {"highlight": self.highlight.to_record()}
+
+
+    @classmethod
+    def from_record(cls, record : Dict[str, Any]) -> Optional[Command]:
+        """
+        Restore the command from a record of the highlight to post.
+        """
+        return cls(command_journal.load_highlight(record["highlight"]))
 
 
     def execute(self) -> None:
@@ -35,4 +59,6 @@ class PostHighlight(Command):
             log.error("Could not post highlight - no footer text")
             return
 
-        self.highlight.post_id = output.post_with_media(text, self.highlight.video)
+        # Update the IDs in place, since they are shared with every later version of this highlight
+        self.highlight.post_id.update(output.post_with_media(text, self.highlight.video))
+        command_journal.record_highlight(self.highlight)
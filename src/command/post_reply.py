@@ -2,9 +2,10 @@
 This module defines the Post Highlight command.
 """
 
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 from src.command.command import Command, Priority
+from src.command.journal import command_journal
 from src.data.highlight import Highlight
 from src.logger import log
 from src.output import output
@@ -15,11 +16,57 @@ class PostReply(Command):
     This class defines the Post Highlight command.
     """
 
+    timeout = 2 * 60
+
     def __init__(self, updated : Highlight, previous : Highlight):
-        self.post_id  : Dict[str, Optional[Dict[str, str]]] = previous.post_id
         self.updated  : Highlight     = updated
         self.previous : Highlight     = previous
-        super().__init__("Post Reply", Priority.NORMAL)
+        super().__init__("Post Reply",
+                         Priority.REPLY,
+                         pool="text",
+                         ordering_key="highlight-" + str(previous.id))
+
+
+    @property
+    def post_id(self) -> Dict[str, Optional[Dict[str, str]]]:
+        """
+        Return the IDs of the original post. These are read when the reply is executed, since the
+        post may not have been sent when the reply was enqueued.
+        """
+        return self.previous.post_id
+
+
+    def get_coalescing_key(self) -> Optional[str]:
+        """
+        Return the key used to coalesce replies for the same highlight.
+        """
+        return "reply-" + str(self.previous.id)
+
+
+    def merge(self, older : Command) -> None:
+        """
+        Reply with the changes made since the state the older reply was based on, so that a
+        single reply covers both updates.
+        """
+        if isinstance(older, PostReply):
+            self.previous = older.previous
+
+
+    def to_record(self) -> Optional[Dict[str, Any]]:
+        """
+        Return a record of the updated highlight and the state it is replying to.
+        """
+        return {"updated": self.updated.to_record(), "previous": self.previous.to_record()}
+
+
+    @classmethod
+    def from_record(cls, record : Dict[str, Any]) -> Optional[Command]:
+        """
+        Restore the command from a record of the updated highlight and the state it is replying
+        to.
+        """
+        return cls(command_journal.load_highlight(record["updated"]),
+                   command_journal.load_highlight(record["previous"]))
 
 
     def execute(self) -> None:
@@ -27,7 +74,7 @@ class PostReply(Command):
         Execute the command.
         """
 
-        if self.post_id is None:
+        if not self.post_id:
             log.error("Could not find existing post for highlight: " + str(self.previous))
             return
 
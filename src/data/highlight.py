@@ -2,13 +2,13 @@
 This module defines a highlight object.
 """
 
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 from src.data.event import Event
 from src.data.game_data import GameData
+from src.data.game_type import GameType
+from src.data.period import Period
 from src.output import templates
-from src.parser.event import EventParser
-from src.parser.game_data import GameDataParser
 from src.logger import log
 
 BASE_URL      : str = "https://players.brightcove.net/"
@@ -16,22 +16,68 @@ BRIGHTCOVE_ID : str = "6415718365001"
 VIDEO_FORMAT  : str = "EXtG1xJ7H_default"
 VIDEO_URL     : str = BASE_URL + BRIGHTCOVE_ID + "/" + VIDEO_FORMAT + "/index.html?videoId="
 
+
+def get_fingerprint(period : Any, data : Any) -> int:
+    """
+    Return a compact fingerprint of the raw goal data that a highlight is built from. Two goals
+    with the same fingerprint produce the same highlight, so unchanged goals can be skipped
+    without constructing any objects.
+    """
+    assists = tuple((assist.get("firstName", {}).get("default"),
+                     assist.get("lastName", {}).get("default"))
+                    for assist in data.get("assists", []))
+    return hash((
+        period.get("number"),
+        period.get("periodType"),
+        data.get("highlightClip"),
+        data.get("firstName", {}).get("default"),
+        data.get("lastName", {}).get("default"),
+        data.get("teamAbbrev", {}).get("default"),
+        assists,
+        data.get("timeInPeriod"),
+        data.get("strength"),
+        data.get("goalModifier"),
+        data.get("homeScore"),
+        data.get("awayScore")
+    ))
+
+
+def load_highlight(record : Dict[str, Any], game_data : Optional[GameData]) -> 'Highlight':
+    """
+    Restore a highlight from a record created by Highlight.to_record.
+    """
+    period    : Period    = Period(GameType(record["game_type"]), record["period"])
+    highlight : Highlight = Highlight(record["game_id"], game_data, period, record["goal"])
+    highlight.post_id = record.get("post_id") or {}
+    return highlight
+
+
 class Highlight:
     """
-    This class defines a Highlight.
+    This class defines a Highlight. The highlight is built directly from a goal in the scoring
+    summary of the landing data, so no additional requests are made to construct it.
     """
 
-    def __init__(self, game_id, data) -> None:
+    def __init__(self,
+                 game_id : int,
+                 game_data : Optional[GameData],
+                 period : Period,
+                 data : Any) -> None:
         self.id        : int                 = int(data["highlightClip"])
-        self.video     : str                 = VIDEO_URL + str(self.id)
         self.game_id   : int                 = game_id
-        self.game_data : Optional[GameData]  = GameDataParser(self.game_id).parse()
+        self.game_data : Optional[GameData]  = game_data
         self.event     : Optional[Event]     = None
         self.goal_id   : int                 = int(data["homeScore"]) + int(data["awayScore"])
         self.post_id   : Dict[str, Optional[Dict[str, str]]] = {}
+        self.source    : Dict[str, Any]      = {
+            "game_id":   game_id,
+            "game_type": period.game_type.value,
+            "period":    {"number": period.number, "periodType": period.period_type},
+            "goal":      data
+        }
 
         if self.game_data:
-            self.event = EventParser(self.game_id, self.goal_id).parse()
+            self.event = Event(period, data)
         else:
             log.error("Game data is null for game: " + str(game_id))
 
@@ -43,6 +89,22 @@ class Highlight:
         return "Highlight: "  + str(self.id)
 
 
+    @property
+    def video(self) -> str:
+        """
+        Return the URL of the highlight video.
+        """
+        return VIDEO_URL + str(self.id)
+
+
+    def to_record(self) -> Dict[str, Any]:
+        """
+        Return a JSON-serializable record of the data this highlight was built from, along with
+        the IDs of its post, so that it can be restored after a restart.
+        """
+        return dict(self.source, post_id=self.post_id)
+
+
     def get_footer(self) -> Optional[str]:
         """
         Return the score string only for a goal event. We use this as an identifier for searching
@@ -70,6 +70,13 @@ class Period:
         """
         self._number = number
 
+    @property
+    def game_type(self):
+        """
+        Getter for the game type.
+        """
+        return self._game_type
+
     @property
     def period_type(self):
         """
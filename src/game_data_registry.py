@@ -0,0 +1,72 @@
+"""
+This module defines the registry of static game data for today's games.
+"""
+
+from threading import Lock
+from typing import Callable, Dict, Optional
+
+from src.data.game_data import GameData
+from src.logger import log
+from src.parser.game_data import GameDataParser
+from src.parser.single_flight import SingleFlight
+
+
+def fetch_game_data(game_id : int) -> Optional[GameData]:
+    """
+    Fetch the game data for the given game ID from the API.
+    """
+    return GameDataParser(game_id).parse()
+
+
+class GameDataRegistry:
+    """
+    This class defines a registry of static game data, keyed by game ID. The data for each game is
+    fetched the first time it is requested and shared by every consumer until the registry is
+    cleared at the end of the day.
+
+    The data is fetched without holding the registry lock, so a slow fetch for one game doesn't
+    delay lookups for the others. Concurrent requests for the same game share a single fetch.
+    """
+
+    def __init__(self, fetch : Callable[[int], Optional[GameData]] = fetch_game_data) -> None:
+        self.game_data : Dict[int, GameData]                 = {}
+        self.lock      : Lock                                = Lock()
+        self.fetch     : Callable[[int], Optional[GameData]] = fetch
+        self.fetches   : SingleFlight[GameData]              = SingleFlight(window=0)
+
+
+    def get(self, game_id : int) -> Optional[GameData]:
+        """
+        Return the game data for the given game ID, fetching it if it has not been retrieved yet.
+        Failed fetches are not stored, so they will be retried on the next request.
+        """
+        with self.lock:
+            if game_id in self.game_data:
+                return self.game_data[game_id]
+
+        game_data : Optional[GameData] = self.fetches.do(str(game_id), lambda: self.load(game_id))
+        if game_data is None:
+            log.error("Could not retrieve game data for game: " + str(game_id))
+        return game_data
+
+
+    def load(self, game_id : int) -> Optional[GameData]:
+        """
+        Fetch the game data for the given game ID and store it if the fetch succeeded.
+        """
+        game_data : Optional[GameData] = self.fetch(game_id)
+        if game_data is not None:
+            with self.lock:
+                self.game_data[game_id] = game_data
+        return game_data
+
+
+    def clear(self) -> None:
+        """
+        Clear the registry of game data.
+        """
+        with self.lock:
+            self.game_data = {}
+
+
+game_data_registry = GameDataRegistry()
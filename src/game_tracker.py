@@ -0,0 +1,158 @@
+"""
+This module defines the GameTracker class.
+"""
+
+import asyncio
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, TypeVar
+
+from src.data.game_data import GameData
+from src.data.game_state import GameState
+from src.game_data_registry import game_data_registry
+from src.parser.content import ContentParser
+from src.parser.game_state import GameStateParser
+from src.logger import log
+from src.metrics import Gauge, Histogram, registry
+
+T = TypeVar("T")
+
+# The number of seconds between polls while a game is being tracked
+POLL_INTERVAL : float = 5
+
+# The number of minutes to continue polling for changes after a game has ended
+TAIL_DURATION : int = 30
+
+# The number of threads used to make blocking API requests. Each tracked game makes up to two
+# requests per poll, and a stalled request holds its thread until it times out on every attempt
+# (about 45 seconds for the landing data), so the pool grows with the number of tracked games.
+# Once the maximum is reached, that many stalled requests delay polling for every game.
+FETCH_WORKERS_PER_GAME : int = 2
+MIN_FETCH_WORKERS      : int = int(os.getenv("MIN_FETCH_WORKERS", "4"))
+MAX_FETCH_WORKERS      : int = int(os.getenv("MAX_FETCH_WORKERS", "64"))
+
+games_live : Gauge = registry.register(Gauge(
+    "games_live", "Games currently being polled for highlights."))
+poll_interval : Histogram = registry.register(Histogram(
+    "tracker_poll_interval_seconds", "Time between the start of consecutive polls of a game."))
+
+
+# pylint: disable=too-few-public-methods
+class FetchPool:
+    """
+    This class defines the pool of threads that make blocking API requests for every tracked
+    game. The pool is sized for the games being tracked before the trackers start.
+    """
+
+    def __init__(self) -> None:
+        self.workers  : int                = MIN_FETCH_WORKERS
+        self.executor : ThreadPoolExecutor = ThreadPoolExecutor(max_workers=self.workers,
+                                                                thread_name_prefix="fetch")
+
+
+    def resize(self, games : int) -> None:
+        """
+        Replace the pool with one sized for the given number of tracked games. Requests that
+        are already running finish on the old pool.
+        """
+        workers : int = max(MIN_FETCH_WORKERS, min(MAX_FETCH_WORKERS,
+                                                   games * FETCH_WORKERS_PER_GAME))
+        if workers == self.workers:
+            return
+        log.info("Using " + str(workers) + " fetch threads for " + str(games) + " games.")
+        previous : ThreadPoolExecutor = self.executor
+        self.workers  = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch")
+        previous.shutdown(wait=False)
+
+
+fetch_pool = FetchPool()
+
+
+async def run_blocking(function : Callable[[], T]) -> T:
+    """
+    Run the given blocking function on the fetch pool without blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(fetch_pool.executor, function)
+
+
+async def sleep_until(until : datetime) -> None:
+    """
+    Sleep until the given time without blocking the event loop.
+    """
+    delay : float = (until - datetime.now(timezone.utc)).total_seconds()
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+class GameTracker:
+    """
+    This class tracks a single game. Every tracker runs as a coroutine on a shared event loop, so
+    any number of games can be tracked without a thread per game.
+    """
+
+    def __init__(self, game_id : int) -> None:
+        self.game_id    : int                = game_id
+        self.game_data  : Optional[GameData] = game_data_registry.get(self.game_id)
+        self.start_time : datetime           = datetime.now(timezone.utc)
+        self.parser     : ContentParser      = ContentParser(self.game_id, self.start_time)
+
+
+    def __str__(self) -> str:
+        return "GameTracker(" + str(self.game_id) + ")"
+
+
+    def is_game_over(self) -> bool:
+        """
+        Return a boolean indicating whether or not the game is over.
+        """
+        state     : GameState = GameStateParser(self.game_id).parse()
+        game_over : bool = state == GameState.OFFICIAL
+        return game_over
+
+
+    async def poll(self) -> None:
+        """
+        Parse the highlights for this game, then wait for the next poll. A failed parse is
+        logged, and the game is parsed again on the next poll.
+        """
+        started : float = time.monotonic()
+        try:
+            await run_blocking(self.parser.parse)
+        except Exception as error: # pylint: disable=broad-exception-caught
+            log.error("Game " + str(self.game_id) + ": Parsing failed: " + repr(error))
+        await asyncio.sleep(POLL_INTERVAL)
+        poll_interval.observe("", time.monotonic() - started)
+
+
+    async def run(self) -> None:
+        """
+        Continuously parse the highlights for this game while it is in progress.
+        """
+        if self.game_data is not None:
+            log.info("Game " + str(self.game_id) + ": Pausing until " + str(self.game_data.date))
+            await sleep_until(self.game_data.date)
+            log.info("Game " + str(self.game_id) + ": The game is live.")
+            games_live.inc()
+            try:
+                while not await run_blocking(self.is_game_over):
+                    await self.poll()
+                log.info("Game " + str(self.game_id) + ": The game is over.")
+
+                # Continue checking for events for another 30 minutes after the game has ended
+                end_time : datetime = datetime.now() + timedelta(minutes = TAIL_DURATION)
+                log.info("Game " + str(self.game_id) + ": Continuing to parse until " +
+                         str(end_time))
+
+                while datetime.now() < end_time:
+                    await self.poll()
+                log.info("Game " + str(self.game_id) + ": Parsing complete.")
+            finally:
+                games_live.dec()
+
+        else:
+            log.error("Could not retrieve game data for game: " + str(self.game_id))
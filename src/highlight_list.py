@@ -12,7 +12,8 @@ class HighlightList:
     """
 
     def __init__(self) -> None:
-        self.highlights : Dict[int, Highlight] = {}
+        self.highlights   : Dict[int, Highlight] = {}
+        self.fingerprints : Dict[int, int]       = {}
 
 
     def add(self, highlight : Highlight) -> None:
@@ -47,8 +48,24 @@ class HighlightList:
         return None
 
 
+    def is_unchanged(self, highlight_id : int, fingerprint : int) -> bool:
+        """
+        Return a boolean indicating whether or not the goal data for this highlight ID matches the
+        fingerprint that was last recorded for it.
+        """
+        return self.fingerprints.get(highlight_id) == fingerprint
+
+
+    def set_fingerprint(self, highlight_id : int, fingerprint : int) -> None:
+        """
+        Record the fingerprint of the goal data last seen for this highlight ID.
+        """
+        self.fingerprints[highlight_id] = fingerprint
+
+
     def clear(self) -> None:
         """
         Clear the list of highlights.
         """
-        self.highlights = {}
+        self.highlights   = {}
+        self.fingerprints = {}
@@ -0,0 +1,110 @@
+"""
+This module defines functions for reading the end of the log file without loading all of it.
+"""
+
+import os
+
+from typing import Iterator, List, Optional
+
+# The number of bytes read from the log file at a time
+BLOCK_SIZE : int = 64 * 1024
+
+# The maximum number of bytes read from the end of the log file for a single request, so that a
+# filter that matches nothing doesn't scan the whole file
+MAX_SCAN_BYTES : int = 64 * 1024 * 1024
+
+# The number of lines returned by default, and the maximum that can be requested
+DEFAULT_LINES : int = 500
+MAX_LINES     : int = 5000
+
+# The log levels, from least to most severe
+LEVELS : List[str] = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+
+def read_lines_reversed(path : str,
+                        block_size : int = BLOCK_SIZE,
+                        limit : int = MAX_SCAN_BYTES) -> Iterator[str]:
+    """
+    Yield the lines of the given file, starting from the last line. The file is read backwards
+    one block at a time, so only a single block is held in memory. Reading stops once the limit
+    has been read; a line that was cut off by the limit is not returned.
+    """
+    with open(path, "rb") as log_file:
+        log_file.seek(0, os.SEEK_END)
+        end       : int   = log_file.tell()
+        position  : int   = end
+        remainder : bytes = b""
+
+        while position > 0 and end - position < limit:
+            size : int = min(block_size, position)
+            position -= size
+            log_file.seek(position)
+            lines : List[bytes] = (log_file.read(size) + remainder).split(b"\n")
+
+            # The first line may continue in the previous block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line.decode("utf-8", errors="replace")
+
+        if position == 0 and remainder:
+            yield remainder.decode("utf-8", errors="replace")
+
+
+def get_level(line : str) -> Optional[str]:
+    """
+    Return the level of the given log line, or None if it doesn't have one, such as a line in
+    the middle of a multi-line message.
+    """
+    fields : List[str] = line.split(" | ", 2)
+    if len(fields) == 3 and fields[1] in LEVELS:
+        return fields[1]
+    return None
+
+
+def is_match(line : str, minimum : int, game : Optional[str]) -> bool:
+    """
+    Return a boolean indicating whether or not the given line is at or above the minimum level
+    and mentions the given game.
+    """
+    if minimum > 0:
+        level : Optional[str] = get_level(line)
+        if level is None or LEVELS.index(level) < minimum:
+            return False
+    return game is None or game in line
+
+
+def tail(path : str,
+         lines : int = DEFAULT_LINES,
+         offset : int = 0,
+         level : Optional[str] = None,
+         game : Optional[str] = None) -> List[str]:
+    """
+    Return up to the given number of lines from the end of the log file, in order, skipping the
+    last offset matching lines so that earlier pages can be requested. If a level is given, only
+    lines at or above that level are returned. If a game ID is given, only lines that mention
+    that game are returned.
+    """
+    if not os.path.exists(path):
+        return []
+
+    lines   = max(0, min(lines, MAX_LINES))
+    minimum : int = LEVELS.index(level.upper()) if level and level.upper() in LEVELS else 0
+    result  : List[str] = []
+    skipped : int = 0
+
+    if lines == 0:
+        return result
+
+    for line in read_lines_reversed(path):
+        if not is_match(line, minimum, game):
+            continue
+        if skipped < offset:
+            skipped += 1
+            continue
+        result.append(line)
+        if len(result) >= lines:
+            break
+
+    result.reverse()
+    return result
@@ -2,37 +2,150 @@
 This module defines logging behaviour for the application.
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
 
+from collections import deque
+from typing import Deque, List, Optional, Set
+
 LOG_FILE    : str = "bot.log"
 LOG_FORMAT  : str = "%(asctime)s | %(levelname)s | %(message)s"
 TIME_FORMAT : str = "%Y-%m-%d %H:%M:%S"
 
+# The number of recent lines kept in memory for new subscribers
+RING_SIZE : int = 1000
+
+# The number of lines buffered for each subscriber. Lines are dropped for a subscriber that falls
+# this far behind, rather than blocking the thread that is logging.
+SUBSCRIBER_QUEUE_SIZE : int = 1000
+
+# The maximum number of subscribers at once. Each one holds a web server thread while it is open.
+MAX_SUBSCRIBERS : int = 2
+
+
+# pylint: disable=too-few-public-methods
+class Subscription:
+    """
+    This class defines a subscription to the lines being logged. The backlog holds the lines that
+    were logged before the subscription was created.
+    """
+
+    def __init__(self, backlog : List[str]) -> None:
+        self.backlog : List[str]        = backlog
+        self.lines   : queue.Queue[str] = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.dropped : int              = 0
+
+
+    def get(self, timeout : float) -> Optional[str]:
+        """
+        Return the next line, or None if no line is logged before the timeout expires.
+        """
+        try:
+            return self.lines.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class BroadcastHandler(logging.Handler):
+    """
+    This class defines a logging handler that keeps the most recent lines in a ring buffer and
+    passes each new line to every subscriber. Subscribers each have a bounded queue, and a line
+    is dropped for any subscriber whose queue is full, so a slow subscriber never blocks logging.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.recent      : Deque[str]        = deque(maxlen=RING_SIZE)
+        self.subscribers : Set[Subscription] = set()
+
+
+    def emit(self, record : logging.LogRecord) -> None:
+        """
+        Add the given record to the ring buffer and pass it to every subscriber. This is called
+        with the handler lock held.
+        """
+        try:
+            line : str = self.format(record)
+        except Exception: # pylint: disable=broad-exception-caught
+            self.handleError(record)
+            return
+        self.recent.append(line)
+        for subscription in self.subscribers:
+            try:
+                subscription.lines.put_nowait(line)
+            except queue.Full:
+                subscription.dropped += 1
+
+
+    def subscribe(self) -> Optional[Subscription]:
+        """
+        Return a new subscription, or None if there are already too many subscribers.
+        """
+        self.acquire()
+        try:
+            if len(self.subscribers) >= MAX_SUBSCRIBERS:
+                return None
+            subscription : Subscription = Subscription(list(self.recent))
+            self.subscribers.add(subscription)
+            return subscription
+        finally:
+            self.release()
+
+
+    def unsubscribe(self, subscription : Subscription) -> None:
+        """
+        Remove the given subscription.
+        """
+        self.acquire()
+        try:
+            self.subscribers.discard(subscription)
+        finally:
+            self.release()
+
 class Logger:
     """
-    This class defines logging behaviour for the application.
+    This class defines logging behaviour for the application. Records are put on a queue by the
+    thread that logs them and written to the handlers by a background listener thread, so the
+    polling and command threads never wait on console or disk I/O.
+
+    The application logs through the root logger to the log file. A named logger, which doesn't
+    pass its records on to the root logger, can be given instead.
     """
 
-    def __init__(self):
+    def __init__(self, path : str = LOG_FILE, name : Optional[str] = None):
 
-        self.logger = logging.getLogger()
+        self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.INFO)
+        self.logger.propagate = name is None
         formatter = logging.Formatter(LOG_FORMAT, TIME_FORMAT)
 
         self.stdout_handler = logging.StreamHandler(sys.stdout)
         self.stdout_handler.setLevel(logging.INFO)
         self.stdout_handler.setFormatter(formatter)
 
-        self.file_handler = logging.handlers.RotatingFileHandler(LOG_FILE,
+        self.file_handler = logging.handlers.RotatingFileHandler(path,
                                                                  maxBytes=1000000000,
                                                                  backupCount=1)
         self.file_handler.setLevel(logging.INFO)
         self.file_handler.setFormatter(formatter)
 
-        self.logger.addHandler(self.stdout_handler)
-        self.logger.addHandler(self.file_handler)
+        self.broadcast_handler = BroadcastHandler()
+        self.broadcast_handler.setLevel(logging.INFO)
+        self.broadcast_handler.setFormatter(formatter)
+
+        self.records  : queue.Queue[logging.LogRecord] = queue.Queue()
+        self.listener = logging.handlers.QueueListener(self.records,
+                                                       self.stdout_handler,
+                                                       self.file_handler,
+                                                       self.broadcast_handler,
+                                                       respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.stop)
+
+        self.logger.addHandler(logging.handlers.QueueHandler(self.records))
 
 
     def info(self, msg):
@@ -63,11 +176,42 @@ class Logger:
         self.logger.debug(msg)
 
 
+    def subscribe(self) -> Optional[Subscription]:
+        """
+        Subscribe to the lines being logged, or return None if there are already too many
+        subscribers.
+        """
+        return self.broadcast_handler.subscribe()
+
+
+    def unsubscribe(self, subscription : Subscription) -> None:
+        """
+        Stop receiving the lines being logged.
+        """
+        self.broadcast_handler.unsubscribe(subscription)
+
+
     def flush(self):
         """
-        Delete the current log file.
+        Delete the current log file. The listener is stopped while the file is rolled over, so
+        that every record logged before this call is written to the old file first.
         """
+        if self.listener is None:
+            self.file_handler.doRollover()
+            return
+        self.listener.stop()
         self.file_handler.doRollover()
+        self.listener.start()
+
+
+    def stop(self):
+        """
+        Write any records that are still queued and stop the listener thread. Records logged
+        after this are discarded.
+        """
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
 
 
 log = Logger()
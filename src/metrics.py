@@ -0,0 +1,332 @@
+"""
+This module defines the metrics used to instrument the bot, and the registry that renders them in
+the Prometheus text format.
+
+Metrics are updated from the polling loops and command workers, so updates never take a lock:
+each thread records into its own shard, and the shards are only combined when the metrics are
+read.
+"""
+
+import math
+
+from abc import ABC, abstractmethod
+from threading import Lock, local
+from typing import Any, Callable, Dict, Generic, List, Mapping, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+M = TypeVar("M", bound="Metric")
+
+# The names of a metric's labels, or the values of those labels for a single sample. A metric with
+# several labels uses a tuple, with one entry for each label.
+Labels = Union[str, Tuple[str, ...]]
+
+# The upper bounds, in seconds, of the buckets used for timing histograms. Commands range from
+# health checks that take milliseconds to media posts that take minutes.
+TIME_BUCKETS : Tuple[float, ...] = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600)
+
+# The upper bounds, in seconds, of the buckets used for API requests and decoding
+FAST_BUCKETS : Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Shards(Generic[T]):
+    """
+    This class defines a set of per-thread shards. A thread creates its shard the first time it
+    records a value, which is the only time a lock is taken.
+    """
+
+    def __init__(self, factory : Callable[[], T]) -> None:
+        self.factory : Callable[[], T] = factory
+        self.local   : local           = local()
+        self.lock    : Lock            = Lock()
+        self.shards  : List[T]         = []
+
+
+    def get(self) -> T:
+        """
+        Return the shard for the current thread.
+        """
+        shard = getattr(self.local, "shard", None)
+        if shard is None:
+            shard = self.factory()
+            with self.lock:
+                self.shards.append(shard)
+            self.local.shard = shard
+        return shard
+
+
+    def all(self) -> List[T]:
+        """
+        Return the shards for every thread.
+        """
+        with self.lock:
+            return list(self.shards)
+
+
+def format_value(value : float) -> str:
+    """
+    Return the given value formatted for the Prometheus text format.
+    """
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_labels(labels : Dict[str, str]) -> str:
+    """
+    Return the given labels formatted for the Prometheus text format.
+    """
+    pairs : List[str] = []
+    for name, value in labels.items():
+        if name:
+            escaped : str = value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+            pairs.append(name + "=\"" + escaped + "\"")
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric(ABC):
+    """
+    This class defines the interface for a metric. Each metric has an optional label, whose
+    values are given when the metric is updated. A metric with several labels is given a tuple
+    of label names, and a tuple of values when it is updated.
+    """
+
+    kind : str = "untyped"
+
+    def __init__(self, name : str = "", description : str = "", label : Labels = "") -> None:
+        self.name        : str    = name
+        self.description : str    = description
+        self.label       : Labels = label
+
+
+    def get_labels(self, value : Labels) -> Dict[str, str]:
+        """
+        Return the labels for a sample with the given label values.
+        """
+        if isinstance(self.label, tuple):
+            return dict(zip(self.label, value))
+        return {self.label: str(value)}
+
+
+    @abstractmethod
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """
+        Return the samples for this metric, as a list of (suffix, labels, value) tuples.
+        """
+
+
+    def render(self) -> List[str]:
+        """
+        Return the lines describing this metric in the Prometheus text format.
+        """
+        lines : List[str] = ["# HELP " + self.name + " " + self.description,
+                             "# TYPE " + self.name + " " + self.kind]
+        for suffix, labels, value in self.samples():
+            lines.append(self.name + suffix + format_labels(labels) + " " + format_value(value))
+        return lines
+
+
+class Counter(Metric):
+    """
+    This class defines a counter, with a separate count for each label value.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name : str = "", description : str = "", label : Labels = "") -> None:
+        super().__init__(name, description, label)
+        self.shards : Shards[Dict[Labels, float]] = Shards(dict)
+
+
+    def inc(self, label : Labels = "", amount : float = 1) -> None:
+        """
+        Increment the count for the given label value.
+        """
+        shard : Dict[Labels, float] = self.shards.get()
+        shard[label] = shard.get(label, 0) + amount
+
+
+    def snapshot(self) -> Dict[Labels, float]:
+        """
+        Return the count for each label value.
+        """
+        totals : Dict[Labels, float] = {}
+        for shard in self.shards.all():
+            for label, value in dict(shard).items():
+                totals[label] = totals.get(label, 0) + value
+        return totals
+
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        return [("", self.get_labels(label), value) for label, value in self.snapshot().items()]
+
+
+class Gauge(Counter):
+    """
+    This class defines a gauge, whose value for each label value can go up and down.
+    """
+
+    kind = "gauge"
+
+
+    def dec(self, label : Labels = "", amount : float = 1) -> None:
+        """
+        Decrement the value for the given label value.
+        """
+        self.inc(label, -amount)
+
+
+class Callback(Metric):
+    """
+    This class defines a gauge whose values are read from a function when the metrics are
+    rendered. This is used to report state that is already tracked elsewhere, such as the depth
+    of the command queue.
+    """
+
+    kind = "gauge"
+
+    def __init__(self,
+                 name : str,
+                 description : str,
+                 label : str,
+                 function : Callable[[], Mapping[str, float]]) -> None:
+        super().__init__(name, description, label)
+        self.function : Callable[[], Mapping[str, float]] = function
+
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        return [("", self.get_labels(label), value) for label, value in self.function().items()]
+
+
+class CounterCallback(Callback):
+    """
+    This class defines a counter whose values are read from a function when the metrics are
+    rendered.
+    """
+
+    kind = "counter"
+
+
+class Histogram(Metric):
+    """
+    This class defines a histogram, with a separate distribution for each label value. Each
+    observation is counted in the first bucket whose upper bound it doesn't exceed, or in the
+    overflow bucket if it exceeds them all. The sum and maximum of the observations are kept
+    after the bucket counts.
+    """
+
+    kind = "histogram"
+
+    def __init__(self,
+                 name : str = "",
+                 description : str = "",
+                 label : str = "",
+                 buckets : Tuple[float, ...] = TIME_BUCKETS) -> None:
+        super().__init__(name, description, label)
+        self.buckets : Tuple[float, ...]               = buckets
+        self.shards  : Shards[Dict[str, List[float]]] = Shards(dict)
+
+
+    def observe(self, label : str, value : float) -> None:
+        """
+        Record an observation for the given label value.
+        """
+        index : int = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+
+        shard  : Dict[str, List[float]] = self.shards.get()
+        counts : List[float]            = shard.get(label) or [0] * (len(self.buckets) + 3)
+        counts[index] += 1
+        counts[-2]    += value
+        counts[-1]     = max(counts[-1], value)
+        shard[label]   = counts
+
+
+    def combine(self) -> Dict[str, List[float]]:
+        """
+        Return the bucket counts, sum and maximum for each label value, combined across every
+        shard.
+        """
+        totals : Dict[str, List[float]] = {}
+        for shard in self.shards.all():
+            for label, counts in dict(shard).items():
+                counts = list(counts)
+                if label in totals:
+                    total : List[float] = totals[label]
+                    for index in range(len(counts) - 1):
+                        total[index] += counts[index]
+                    total[-1] = max(total[-1], counts[-1])
+                else:
+                    totals[label] = counts
+        return totals
+
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return a summary of the distribution for each label value. The buckets are cumulative,
+        so each one counts the observations that didn't exceed its upper bound.
+        """
+        summary : Dict[str, Dict[str, Any]] = {}
+        for label, counts in self.combine().items():
+            total      : int            = 0
+            cumulative : Dict[str, int] = {}
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                total += int(count)
+                cumulative[str(bound)] = total
+            summary[label] = {
+                "count":   total,
+                "sum":     counts[-2],
+                "mean":    counts[-2] / total,
+                "max":     counts[-1],
+                "buckets": cumulative
+            }
+        return summary
+
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        samples : List[Tuple[str, Dict[str, str], float]] = []
+        for label, summary in self.snapshot().items():
+            for bound, count in zip(self.buckets + (math.inf,), summary["buckets"].values()):
+                samples.append(("_bucket", {**self.get_labels(label), "le": format_value(bound)},
+                                count))
+            samples.append(("_sum", self.get_labels(label), summary["sum"]))
+            samples.append(("_count", self.get_labels(label), summary["count"]))
+        return samples
+
+
+class Registry:
+    """
+    This class defines the registry of metrics that are exported by the application.
+    """
+
+    def __init__(self) -> None:
+        self.lock    : Lock              = Lock()
+        self.metrics : Dict[str, Metric] = {}
+
+
+    def register(self, metric : M) -> M:
+        """
+        Register the given metric, replacing any metric with the same name, and return it.
+        """
+        with self.lock:
+            self.metrics[metric.name] = metric
+        return metric
+
+
+    def render(self) -> str:
+        """
+        Return every registered metric in the Prometheus text format.
+        """
+        with self.lock:
+            metrics : List[Metric] = list(self.metrics.values())
+        lines : List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
@@ -9,17 +9,17 @@ import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from os.path import join, dirname, abspath
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, List, Optional
 
 from dateutil import parser
 
-import atproto
-import requests
-
 from dotenv import load_dotenv
 
 from src.logger import log
-from src.output.outputter import Outputter
+from src.output.outputter import Outputter, duplicates_skipped, upload_bytes, upload_time
+from src.output.token_manager import TokenManager
+from src.output.video_service import VideoService
+from src.output.video_cache import video_cache
 from src.output import video
 from src import schedule
 from src import utils
@@ -27,10 +27,9 @@ from src import utils
 # maximum post length
 MAX_LENGTH = 240 # characters
 
-# Bluesky API base URL
-BASE_URL = "https://bsky.social/xrpc/"
-
-REQUEST_TIMEOUT = 30
+# The number of seconds to wait after uploading a video as a plain blob, which has no processing
+# status to poll, before posting it
+BLOB_SETTLE_TIME = 30
 
 
 def now() -> str:
@@ -116,12 +115,8 @@ class BlueSky(Outputter):
     def __init__(self) -> None:
         super().__init__()
         self.auth         : Authentication = Authentication()
-        self.session      : Optional[dict] = None
-        self.client       : atproto.Client = atproto.Client()
-        self.client.login(self.auth.handle, self.auth.password)
-        self.user_id = ""
-        self.access_token = ""
-        self.create_session()
+        self.tokens       : TokenManager   = TokenManager(self.auth.handle, self.auth.password)
+        self.videos       : VideoService   = VideoService(self.tokens)
 
         # Get any posts made my the account so far today
         self.posts = self.get_today_posts()
@@ -134,42 +129,27 @@ class BlueSky(Outputter):
         return "bluesky"
 
 
-    def create_session(self):
-        """
-        Create a new session with the Bluesky API.
-        """
-        response = requests.post(
-            BASE_URL + "com.atproto.server.createSession",
-            json={
-                "identifier": self.auth.handle,
-                "password": self.auth.password
-                },
-            timeout=REQUEST_TIMEOUT)
-        self.session       = response.json()
-        self.access_token  = self.session["accessJwt"]
-        self.refresh_token = self.session["refreshJwt"]
-
-
     def request(self, post : dict) -> Optional[Dict[str, str]]:
         """
         Send a POST request to the Bluesky API with the given post data.
         """
 
-        self.create_session()
+        session : Optional[Dict[str, Any]] = self.tokens.get_session()
 
-        if self.session is None:
+        if session is None:
             log.error("Bluesky - Could not create session.")
             return None
 
-        response = requests.post(
-                    BASE_URL + "com.atproto.repo.createRecord",
-                    headers={"Authorization": "Bearer " + self.access_token},
-                    json={
-                        "repo": self.session["did"],
-                        "collection": "app.bsky.feed.post",
-                        "record": post,
-                    },
-                    timeout=REQUEST_TIMEOUT)
+        response = self.tokens.send("POST",
+                                    "com.atproto.repo.createRecord",
+                                    json={
+                                        "repo": session["did"],
+                                        "collection": "app.bsky.feed.post",
+                                        "record": post,
+                                    })
+
+        if response is None:
+            return None
 
         if response.ok:
             self.add_post(post["text"])
@@ -195,6 +175,7 @@ class BlueSky(Outputter):
 
         if text in self.posts:
             log.warning("Bluesky - Skipping duplicate post")
+            duplicates_skipped.inc(self.name())
             return None
 
         post : dict[Any, Any] = {
@@ -224,6 +205,7 @@ class BlueSky(Outputter):
 
         if text in self.posts:
             log.warning("Bluesky - Skipping duplicate post")
+            duplicates_skipped.inc(self.name())
             return None
 
         if "cid" not in parent or "uri" not in parent:
@@ -250,52 +232,63 @@ class BlueSky(Outputter):
         return self.request(post)
 
 
-    def upload_video(self, url : str) -> Optional[str]:
+    def upload_video(self, url : str) -> Optional[Dict[str, Any]]:
         """
-        Download the .mp4 from the given URL, perform a media upload,
-        clean up and then return the media ID string.
+        Upload the cached .mp4 for the given URL, downloading it first if necessary, and return
+        the uploaded blob.
         """
-        filename : str  = "highlight" + url[-8:-3] + ".mp4"
-        data     : Optional[bytes] = None
-
-        log.verbose("Bluesky - uploading video: " + filename)
+        with video_cache.open(url) as filename:
+            if filename is None:
+                log.error("Bluesky - Could not download from url: " + url)
+                return None
+            blob = self.upload_file(filename)
 
-        video.download(url, filename)
-
-        if not os.path.exists(filename):
-            log.error("Bluesky - Could not download from url: " + url)
+        if blob is None:
+            log.error("Bluesky - Failed to upload video: " + url)
             return None
 
-        video.normalize_video(filename)
-        data = video.read(filename)
+        log.verbose("Bluesky - Video uploaded: " + str(blob))
+        return blob
 
-        if data is None:
-            log.error("Bluesky - Failed to read video file: " + filename)
-            return None
 
-        self.create_session()
-        response = requests.post(
-            BASE_URL + "com.atproto.repo.uploadBlob",
-            headers={
-                "Content-Type": "video/mp4",
-                "Authorization": "Bearer " + self.access_token,
-            },
-            data=data,
-            timeout=300)
+    def upload_file(self, filename : str) -> Optional[Dict[str, Any]]:
+        """
+        Upload the given video file, falling back to a plain blob if the video service fails, and
+        return the uploaded blob.
+        """
+        log.verbose("Bluesky - uploading video: " + filename)
+        size : int = video.get_size(filename)
+
+        # Stream the upload from the file, so the video is never held in memory
+        started : float = time.monotonic()
+        with open(filename, "rb") as data:
+            blob = self.videos.upload(data, size, os.path.basename(filename))
+            if blob is None:
+                log.warning("Bluesky - Video service upload failed, uploading blob instead.")
+                blob = self.upload_blob(data, size)
+        upload_time.observe(self.name(), time.monotonic() - started)
+        upload_bytes.inc(self.name(), size)
+        return blob
 
-        video.remove(filename)
 
-        if not response.ok:
-            log.error("Bluesky - Failed to upload blob: " + filename)
+    def upload_blob(self, data : BinaryIO, size : int) -> Optional[Dict[str, Any]]:
+        """
+        Upload the given video file as a plain blob, for when the video service is unavailable.
+        The blob has no processing status to poll, so wait a fixed time for it to settle.
+        """
+        data.seek(0)
+        response = self.tokens.send("POST",
+                                    "com.atproto.repo.uploadBlob",
+                                    headers={"Content-Type": "video/mp4",
+                                             "Content-Length": str(size)},
+                                    data=data,
+                                    timeout=300)
+        if response is None or not response.ok:
             return None
 
-        blob = response.json()["blob"]
-        log.verbose("Bluesky - Blob uploaded: " + str(blob))
-
         log.verbose("Bluesky - Waiting for blob upload to complete...")
-        time.sleep(30)
-
-        return blob
+        time.sleep(BLOB_SETTLE_TIME)
+        return response.json()["blob"]
 
 
     def post_with_media(self, text : str, media : str) -> Optional[Dict[str, str]]:
@@ -311,6 +304,7 @@ class BlueSky(Outputter):
 
         if utils.strip_text(text) in self.posts:
             log.warning("Bluesky - Skipping duplicate post: " + utils.strip_text(text))
+            duplicates_skipped.inc(self.name())
             return None
 
         blob = self.upload_video(media)
@@ -353,6 +347,7 @@ class BlueSky(Outputter):
 
         if utils.strip_text(text) in self.posts:
             log.warning("Bluesky - Skipping duplicate post: " + utils.strip_text(text))
+            duplicates_skipped.inc(self.name())
             return None
 
         if "cid" not in parent or "uri" not in parent:
@@ -409,21 +404,28 @@ class BlueSky(Outputter):
         Return a list of posts that were created today. If a query is
         provided, return only posts that include the query as a substring.
         """
-        if self.session is None:
+        session : Optional[Dict[str, Any]] = self.tokens.get_session()
+        if session is None:
             return []
 
-        did = self.session.get("did")
+        did = session.get("did")
         if did is None:
             log.error("Bluesky - Could not retrieve today's posts.")
             return []
 
-        feed = self.client.get_author_feed(actor=did, limit=100)
+        response = self.tokens.send("GET",
+                                    "app.bsky.feed.getAuthorFeed",
+                                    params={"actor": did, "limit": 100})
+        if response is None or not response.ok:
+            log.error("Bluesky - Could not retrieve today's posts.")
+            return []
+
         result = []
-        if feed is not None:
-            for post in feed.feed:
-                utc_time     = parser.parse(post.post.record.created_at)
-                post_date    = schedule.utc_to_local(utc_time).date()
-                current_date = schedule.get_current_date().date()
-                if post_date == current_date:
-                    result.append(utils.strip_text(post.post.record.text))
+        for item in response.json().get("feed", []):
+            record       = item.get("post", {}).get("record", {})
+            utc_time     = parser.parse(record.get("createdAt"))
+            post_date    = schedule.utc_to_local(utc_time).date()
+            current_date = schedule.get_current_date().date()
+            if post_date == current_date:
+                result.append(utils.strip_text(record.get("text", "")))
         return result
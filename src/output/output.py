@@ -4,7 +4,7 @@ This module defines the output method.
 
 from typing import Dict, List, Optional
 
-from src.output.outputter import Outputter
+from src.output.outputter import Outputter, posts_failed, posts_sent
 from src.output.printer import Printer
 from src.output.bluesky import BlueSky
 
@@ -49,6 +49,16 @@ class Output:
 output = Output()
 
 
+def count(outputter : Outputter, kind : str, post_id : Optional[Dict[str, str]]) -> None:
+    """
+    Count the given result of sending a post or reply. The kind is either "post" or "reply".
+    """
+    if post_id is None:
+        posts_failed.inc((outputter.name(), kind))
+    else:
+        posts_sent.inc((outputter.name(), kind))
+
+
 def post(text: str) -> Dict[str, Optional[Dict[str, str]]]:
     """
     Send a post with the specified text.
@@ -56,6 +66,7 @@ def post(text: str) -> Dict[str, Optional[Dict[str, str]]]:
     post_ids: Dict[str, Optional[Dict[str, str]]] = {}
     for outputter in output.outputters:
         post_id : Optional[Dict[str, str]] = outputter.post(text)
+        count(outputter, "post", post_id)
         post_ids[outputter.name()] = post_id
     return post_ids
 
@@ -70,6 +81,7 @@ def reply(parents : Dict[str, Optional[Dict[str, str]]],
         parent : Optional[Dict[str, str]] = parents.get(outputter.name())
         if parent is not None:
             post_id: Optional[Dict[str, str]] = outputter.reply(parent, text)
+            count(outputter, "reply", post_id)
             post_ids[outputter.name()] = post_id
     return post_ids
 
@@ -81,6 +93,7 @@ def post_with_media(text: str, media: str) -> Dict[str, Optional[Dict[str, str]]
     post_ids : Dict[str, Optional[Dict[str, str]]] = {}
     for outputter in output.outputters:
         post_id : Optional[Dict[str, str]] = outputter.post_with_media(text, media)
+        count(outputter, "post", post_id)
         post_ids[outputter.name()] = post_id
     return post_ids
 
@@ -98,6 +111,7 @@ def reply_with_media(
         parent: Optional[Dict[str, str]] = parents.get(outputter.name())
         if parent is not None:
             post_id : Optional[Dict[str, str]] = outputter.reply_with_media(parent, text, media)
+            count(outputter, "reply", post_id)
             post_ids[outputter.name()] = post_id
     return post_ids
 
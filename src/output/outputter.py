@@ -6,6 +6,18 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Optional
 
 from src import utils
+from src.metrics import Counter, Histogram, registry
+
+posts_sent : Counter = registry.register(Counter(
+    "posts_sent_total", "Posts and replies sent.", ("outputter", "kind")))
+posts_failed : Counter = registry.register(Counter(
+    "posts_failed_total", "Posts and replies that could not be sent.", ("outputter", "kind")))
+duplicates_skipped : Counter = registry.register(Counter(
+    "duplicate_posts_skipped_total", "Posts skipped because they were already sent.", "outputter"))
+upload_bytes : Counter = registry.register(Counter(
+    "media_upload_bytes_total", "Bytes of media uploaded.", "outputter"))
+upload_time : Histogram = registry.register(Histogram(
+    "media_upload_seconds", "Time taken to upload media.", "outputter"))
 
 class Outputter(ABC):
     """
@@ -0,0 +1,185 @@
+"""
+This module defines the token manager used to authenticate requests to the Bluesky API.
+"""
+
+import base64
+import binascii
+import json
+import time
+
+from threading import Lock
+from typing import Any, Dict, Optional
+
+import requests
+
+from src.logger import log
+from src.session import create_session
+
+# Bluesky API base URL
+BASE_URL : str = "https://bsky.social/xrpc/"
+
+REQUEST_TIMEOUT : int = 30
+
+# The number of seconds before an access token expires that it is refreshed, so that a token
+# doesn't expire while a request is in flight
+EXPIRY_MARGIN : float = 60
+
+# The errors returned by the API when the access token is no longer accepted
+TOKEN_ERRORS = ("ExpiredToken", "InvalidToken")
+
+
+def get_expiry(token : str) -> float:
+    """
+    Return the expiry time of the given JWT, in seconds since the epoch, or zero if it can't be
+    determined.
+    """
+    try:
+        payload : str = token.split(".")[1]
+        claims  : Any = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims.get("exp", 0))
+    except (IndexError, ValueError, AttributeError, binascii.Error):
+        return 0
+
+
+def is_token_rejected(response : requests.Response) -> bool:
+    """
+    Return a boolean indicating whether or not the response indicates that the access token was
+    not accepted.
+    """
+    if response.status_code == 401:
+        return True
+    if response.status_code == 400:
+        try:
+            return response.json().get("error") in TOKEN_ERRORS
+        except ValueError:
+            return False
+    return False
+
+
+class TokenManager:
+    """
+    This class manages the session used to authenticate requests to the Bluesky API. The access
+    token is created once and reused until it is about to expire, or until the API rejects it.
+    It is then renewed with the refresh token, and a new session is only created with the
+    password if the refresh fails. The manager can be shared by every thread that posts.
+    """
+
+    def __init__(self, handle : str, password : str, base_url : str = BASE_URL) -> None:
+        self.handle     : str                      = handle
+        self.password   : str                      = password
+        self.base_url   : str                      = base_url
+        self.lock       : Lock                     = Lock()
+        self.http       : requests.Session         = create_session(pool_connections=2,
+                                                                    pool_size=4)
+        self.session    : Optional[Dict[str, Any]] = None
+        self.expires_at : float                    = 0
+
+
+    def get_session(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the current session, creating or refreshing it if necessary.
+        """
+        with self.lock:
+            if self.session is None:
+                self.create()
+            elif time.time() > self.expires_at - EXPIRY_MARGIN:
+                self.refresh()
+            return self.session
+
+
+    def invalidate(self, session : Dict[str, Any]) -> None:
+        """
+        Refresh the given session after its access token was rejected. If another thread has
+        already replaced it, the new session is kept.
+        """
+        with self.lock:
+            if self.session is not None and self.session is session:
+                self.refresh()
+
+
+    def create(self) -> None:
+        """
+        Create a new session using the password. The lock must be held.
+        """
+        log.info("Bluesky - Creating session.")
+        try:
+            response = self.http.post(self.base_url + "com.atproto.server.createSession",
+                                      json={"identifier": self.handle, "password": self.password},
+                                      timeout=REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException as error:
+            log.error("Bluesky - Could not create session: " + str(error))
+            self.session = None
+            return
+        self.update(response)
+
+
+    def refresh(self) -> None:
+        """
+        Renew the session using the refresh token, or create a new session if that fails. The
+        lock must be held.
+        """
+        if self.session is None:
+            self.create()
+            return
+        log.verbose("Bluesky - Refreshing session.")
+        try:
+            response = self.http.post(
+                self.base_url + "com.atproto.server.refreshSession",
+                headers={"Authorization": "Bearer " + self.session["refreshJwt"]},
+                timeout=REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException as error:
+            log.error("Bluesky - Could not refresh session: " + str(error))
+            response = None
+        if response is None or not response.ok:
+            self.create()
+            return
+        self.update(response)
+
+
+    def update(self, response : requests.Response) -> None:
+        """
+        Store the session in the given response. The lock must be held.
+        """
+        if not response.ok:
+            log.error("Bluesky - Session request failed: " + response.text)
+            self.session = None
+            return
+        session : Dict[str, Any] = response.json()
+        self.session    = session
+        self.expires_at = get_expiry(session["accessJwt"])
+
+
+    def send(self, method : str, endpoint : str, **kwargs) -> Optional[requests.Response]:
+        """
+        Send an authenticated request to the given endpoint. If the access token is rejected,
+        the session is refreshed and the request is sent once more, rewinding a file being
+        uploaded first. Return None if there is no session or the request could not be sent.
+        """
+        headers : Dict[str, str] = dict(kwargs.pop("headers", {}))
+        timeout : float          = kwargs.pop("timeout", REQUEST_TIMEOUT)
+
+        for attempt in range(2):
+            session : Optional[Dict[str, Any]] = self.get_session()
+            if session is None:
+                log.error("Bluesky - Could not create session.")
+                return None
+
+            if attempt > 0 and hasattr(kwargs.get("data"), "seek"):
+                kwargs["data"].seek(0)
+
+            headers["Authorization"] = "Bearer " + session["accessJwt"]
+            try:
+                response = self.http.request(method,
+                                             self.base_url + endpoint,
+                                             headers=headers,
+                                             timeout=timeout,
+                                             **kwargs)
+            except requests.exceptions.RequestException as error:
+                log.error("Bluesky - Request to " + endpoint + " failed: " + str(error))
+                return None
+            if attempt == 0 and is_token_rejected(response):
+                log.warning("Bluesky - Access token was rejected, refreshing session.")
+                self.invalidate(session)
+                continue
+            return response
+        return None
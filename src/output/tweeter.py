@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, List, Optional
 import os
+import time
 from os.path import join, dirname, abspath
 
 import tweepy
@@ -17,7 +18,8 @@ from dotenv import load_dotenv
 from src import schedule
 from src.logger import log
 from src.output import video
-from src.output.outputter import Outputter
+from src.output.outputter import Outputter, duplicates_skipped, upload_bytes, upload_time
+from src.output.video_cache import video_cache
 
 from src import utils
 
@@ -121,6 +123,7 @@ class Tweeter(Outputter):
 
         if self.has_posted(text):
             log.warning("Twitter - Skipping duplicate post: " + utils.strip_text(text))
+            duplicates_skipped.inc(self.name())
             return None
 
         try:
@@ -158,6 +161,7 @@ class Tweeter(Outputter):
 
         if self.has_posted(text):
             log.warning("Twitter - Skipping duplicate post: " + utils.strip_text(text))
+            duplicates_skipped.inc(self.name())
             return None
 
         try:
@@ -174,20 +178,19 @@ class Tweeter(Outputter):
 
     def upload_video(self, url : str) -> Optional[str]:
         """
-        Download the .mp4 from the given URL, perform a media upload, clean up and then
-        return the media ID string.
+        Upload the cached .mp4 for the given URL, downloading it first if necessary, and return
+        the media ID string.
         """
-        filename : str  = "highlight" + url[-8:-3] + ".mp4"
-
-        video.download(url, filename)
-
-        if not os.path.exists(filename):
-            log.error("Twitter - Could not download from url: " + url)
-            return None
-
-        log.verbose("Twitter - Uploading video: " + filename)
-        media = self.api.media_upload(filename, media_category="tweet_video")
-        video.remove(filename)
+        with video_cache.open(url) as filename:
+            if filename is None:
+                log.error("Twitter - Could not download from url: " + url)
+                return None
+
+            log.verbose("Twitter - Uploading video: " + filename)
+            started : float = time.monotonic()
+            media = self.api.media_upload(filename, media_category="tweet_video")
+            upload_time.observe(self.name(), time.monotonic() - started)
+            upload_bytes.inc(self.name(), video.get_size(filename))
         return media.media_id_string
 
 
@@ -205,6 +208,7 @@ class Tweeter(Outputter):
 
         if self.has_posted(text):
             log.warning("Twitter - Skipping duplicate post: " + utils.strip_text(text))
+            duplicates_skipped.inc(self.name())
             return None
 
         try:
@@ -252,6 +256,7 @@ class Tweeter(Outputter):
 
         if self.has_posted(text):
             log.warning("Twitter - Skipping duplicate post: " + utils.strip_text(text))
+            duplicates_skipped.inc(self.name())
             return None
 
         try:
@@ -5,8 +5,6 @@ This module contains functions for downloading, trimming, and normalizing videos
 import os
 import time
 
-from typing import Optional
-
 import urllib
 import pymediainfo
 import youtube_dl
@@ -17,13 +15,15 @@ from src.logger import log
 
 MAXIMUM_DURATION=60 # seconds
 MAXIMUM_SIZE=50000000 # bytes
+DOWNLOAD_TIMEOUT=30 # seconds
 
 def download_file(url : str, filename : str) -> bool:
     """
     Download the .mp4 from the given URL.
     """
     success : bool = False
-    with youtube_dl.YoutubeDL({"outtmpl": filename, "quiet": True}) as ydl:
+    options = {"outtmpl": filename, "quiet": True, "socket_timeout": DOWNLOAD_TIMEOUT}
+    with youtube_dl.YoutubeDL(options) as ydl:
         try:
             ydl.download([url])
             success = True
@@ -97,21 +97,6 @@ def normalize_video(file : str):
         # For now we just log an error, but we could compress this video in the future if needed.
 
 
-def read(file : str) -> Optional[bytes]:
-    """
-    Read the contents of the file.
-    """
-    data = None
-    if not os.path.exists(file):
-        log.error("File does not exist: " + file)
-        return None
-
-    with open(file, 'rb') as f:
-        data = f.read()
-
-    return data
-
-
 def remove(file : str) -> None:
     """
     Remove the file.
@@ -0,0 +1,182 @@
+"""
+This module defines the video cache, which downloads and normalizes each highlight video once and
+shares the file with every outputter and every retry of a post.
+"""
+
+import os
+import tempfile
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Iterator, Optional
+
+from src.logger import log
+from src.output import video
+
+# The directory that cached videos are stored in
+CACHE_DIRECTORY : str = os.path.join(tempfile.gettempdir(), "goal-bot-videos")
+
+# The maximum number of bytes of video kept on disk. Least recently used videos are removed once
+# the cache grows past this size.
+CACHE_BUDGET : int = int(os.getenv("VIDEO_CACHE_BYTES", str(500 * 1024 * 1024)))
+
+# The number of videos downloaded at the same time
+CACHE_WORKERS : int = 2
+
+
+def get_key(url : str) -> str:
+    """
+    Return the cache key for the video at the given URL, which is the highlight ID at its end.
+    """
+    return url.rsplit("=", 1)[-1]
+
+
+def get_filename(url : str) -> str:
+    """
+    Return the name of the file for the video at the given URL.
+    """
+    return "highlight" + get_key(url) + ".mp4"
+
+
+class VideoCache:
+    """
+    This class stores normalized highlight videos on disk, keyed by highlight ID. A video is
+    downloaded once, either in the background as soon as its highlight is found or by the first
+    outputter that needs it. Callers that ask for a video while it is downloading wait for that
+    download instead of starting another, so two uploads never write the same file.
+
+    Videos are kept until the total size of the cache exceeds the budget, at which point the least
+    recently used videos are removed. A video that is downloading or being uploaded is never
+    removed.
+    """
+
+    def __init__(self,
+                 directory : str = CACHE_DIRECTORY,
+                 budget : int = CACHE_BUDGET,
+                 workers : int = CACHE_WORKERS) -> None:
+        self.directory : str                                      = directory
+        self.budget    : int                                      = budget
+        self.lock      : Lock                                     = Lock()
+        self.executor  : ThreadPoolExecutor                       = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="video")
+        self.entries   : OrderedDict[str, Future[Optional[str]]] = OrderedDict()
+        self.sizes     : Dict[str, int]                           = {}
+        self.users     : Dict[str, int]                           = {}
+
+
+    def fetch(self, url : str) -> Future[Optional[str]]:
+        """
+        Return the download of the video at the given URL, starting it if it isn't already cached
+        or downloading, and mark the video as the most recently used. The lock must be held.
+        """
+        key : str = get_key(url)
+        entry : Optional[Future[Optional[str]]] = self.entries.get(key)
+        if entry is None:
+            log.verbose("Downloading video: " + url)
+            entry = self.executor.submit(self.download, url)
+            self.entries[key] = entry
+        self.entries.move_to_end(key)
+        return entry
+
+
+    def prefetch(self, url : str) -> None:
+        """
+        Start downloading the video at the given URL in the background, unless it is already cached
+        or downloading.
+        """
+        with self.lock:
+            self.fetch(url)
+
+
+    def download(self, url : str) -> Optional[str]:
+        """
+        Download and normalize the video at the given URL, and return the path of the file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        filename : str = os.path.join(self.directory, get_filename(url))
+        video.download(url, filename)
+        if not os.path.exists(filename):
+            log.error("Could not download video: " + url)
+            return None
+        video.normalize_video(filename)
+
+        with self.lock:
+            self.sizes[get_key(url)] = video.get_size(filename)
+            self.evict()
+        return filename
+
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used videos until the cache is within its budget. The lock
+        must be held.
+        """
+        for key in list(self.entries):
+            if sum(self.sizes.values()) <= self.budget:
+                return
+            entry : Future[Optional[str]] = self.entries[key]
+            if entry.done() and self.users.get(key, 0) == 0:
+                log.verbose("Removing cached video: " + key)
+                del self.entries[key]
+                self.sizes.pop(key, None)
+                remove(entry)
+
+
+    @contextmanager
+    def open(self, url : str) -> Iterator[Optional[str]]:
+        """
+        Yield the path of the cached video for the given URL, downloading it first if necessary.
+        The file is kept until the caller is finished with it. None is yielded if the video could
+        not be downloaded, and the download is tried again the next time the video is requested.
+        """
+        key : str = get_key(url)
+        with self.lock:
+            entry : Future[Optional[str]] = self.fetch(url)
+            self.users[key] = self.users.get(key, 0) + 1
+
+        try:
+            try:
+                filename : Optional[str] = entry.result()
+            except Exception as error: # pylint: disable=broad-exception-caught
+                log.error("Video download failed: " + str(error))
+                filename = None
+
+            if filename is None:
+                with self.lock:
+                    if self.entries.get(key) is entry:
+                        del self.entries[key]
+            yield filename
+        finally:
+            with self.lock:
+                self.users[key] -= 1
+                if self.users[key] == 0:
+                    del self.users[key]
+                self.evict()
+
+
+    def clear(self) -> None:
+        """
+        Remove every cached video.
+        """
+        with self.lock:
+            entries = list(self.entries.values())
+            self.entries.clear()
+            self.sizes.clear()
+        for entry in entries:
+            entry.add_done_callback(remove)
+
+
+def remove(entry : Future) -> None:
+    """
+    Remove the file downloaded by the given entry, if any.
+    """
+    if entry.cancelled() or entry.exception() is not None:
+        return
+    filename : Optional[str] = entry.result()
+    if filename is not None and os.path.exists(filename):
+        os.remove(filename)
+
+
+video_cache = VideoCache()
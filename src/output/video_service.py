@@ -0,0 +1,169 @@
+"""
+This module defines the client for the Bluesky video service, which processes uploaded videos
+before they are posted.
+"""
+
+import os
+import time
+
+from typing import Any, BinaryIO, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from src.logger import log
+from src.metrics import Histogram, registry
+from src.output.token_manager import TokenManager
+
+# Bluesky video service base URL
+VIDEO_SERVICE_URL : str = "https://video.bsky.app/xrpc/"
+
+# The maximum number of seconds to wait for the video service to process an upload
+PROCESSING_TIMEOUT : float = float(os.getenv("VIDEO_PROCESSING_TIMEOUT", "120"))
+
+# The number of seconds between polls of the job status. The interval starts small, since short
+# clips are often ready within a few seconds, and grows up to the maximum.
+POLL_INITIAL : float = 0.5
+POLL_MAXIMUM : float = 5
+POLL_FACTOR  : float = 2
+
+UPLOAD_TIMEOUT  : int = 300
+REQUEST_TIMEOUT : int = 30
+
+JOB_COMPLETED : str = "JOB_STATE_COMPLETED"
+JOB_FAILED    : str = "JOB_STATE_FAILED"
+
+processing_time : Histogram = registry.register(Histogram(
+    "video_processing_seconds", "Time spent waiting for uploaded videos to be processed.", "state"))
+
+
+def get_service_did(session : Dict[str, Any], base_url : str) -> str:
+    """
+    Return the DID of the account's server, which the service token must be issued for. This is
+    read from the DID document in the session, falling back to the host of the API.
+    """
+    for service in session.get("didDoc", {}).get("service", []):
+        if service.get("id") == "#atproto_pds" and service.get("serviceEndpoint"):
+            return "did:web:" + str(urlparse(service["serviceEndpoint"]).hostname)
+    return "did:web:" + str(urlparse(base_url).hostname)
+
+
+class VideoService:
+    """
+    This class uploads videos to the Bluesky video service. The upload is authorized with a
+    service token issued by the account's server, and the service then processes the video in a
+    job. The job status is polled, with an increasing interval, until the processed video is
+    ready to be embedded in a post.
+    """
+
+    def __init__(self,
+                 tokens : TokenManager,
+                 base_url : str = VIDEO_SERVICE_URL,
+                 timeout : float = PROCESSING_TIMEOUT) -> None:
+        self.tokens   : TokenManager = tokens
+        self.base_url : str          = base_url
+        self.timeout  : float        = timeout
+
+
+    def get_service_token(self, session : Dict[str, Any]) -> Optional[str]:
+        """
+        Return a short-lived token that authorizes the video service to upload a blob on behalf
+        of the account.
+        """
+        response = self.tokens.send("GET",
+                                    "com.atproto.server.getServiceAuth",
+                                    params={
+                                        "aud": get_service_did(session, self.tokens.base_url),
+                                        "lxm": "com.atproto.repo.uploadBlob",
+                                        "exp": int(time.time()) + 30 * 60
+                                    })
+        if response is None or not response.ok:
+            log.error("Bluesky - Could not get service token for video upload.")
+            return None
+        return response.json().get("token")
+
+
+    def upload(self, data : BinaryIO, size : int, name : str) -> Optional[Dict[str, Any]]:
+        """
+        Upload the given video file, wait for it to be processed, and return the processed blob.
+        The file is streamed from its current position in chunks, so memory use doesn't depend on
+        the size of the video. Return None if the upload or processing fails.
+        """
+        session : Optional[Dict[str, Any]] = self.tokens.get_session()
+        if session is None:
+            return None
+
+        token : Optional[str] = self.get_service_token(session)
+        if token is None:
+            return None
+
+        try:
+            response = self.tokens.http.post(self.base_url + "app.bsky.video.uploadVideo",
+                                             params={"did": session["did"], "name": name},
+                                             headers={"Authorization": "Bearer " + token,
+                                                      "Content-Type": "video/mp4",
+                                                      "Content-Length": str(size)},
+                                             data=data,
+                                             timeout=UPLOAD_TIMEOUT)
+            status : Dict[str, Any] = response.json()
+        except (requests.exceptions.RequestException, ValueError) as error:
+            log.error("Bluesky - Video upload failed: " + str(error))
+            return None
+
+        # A video that was uploaded before is reported as a conflict, along with its job
+        job_id : Optional[str] = status.get("jobId") or status.get("jobStatus", {}).get("jobId")
+        if job_id is None:
+            log.error("Bluesky - Video upload failed: " + response.text)
+            return None
+
+        log.verbose("Bluesky - Video uploaded, waiting for job: " + job_id)
+        return self.wait(job_id)
+
+
+    def get_job_status(self, job_id : str) -> Optional[Dict[str, Any]]:
+        """
+        Return the status of the given processing job, or None if it can't be retrieved.
+        """
+        try:
+            response = self.tokens.http.get(self.base_url + "app.bsky.video.getJobStatus",
+                                            params={"jobId": job_id},
+                                            timeout=REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException as error:
+            log.warning("Bluesky - Could not get video job status: " + str(error))
+            return None
+        if not response.ok:
+            log.warning("Bluesky - Could not get video job status: " + response.text)
+            return None
+        return response.json().get("jobStatus")
+
+
+    def wait(self, job_id : str) -> Optional[Dict[str, Any]]:
+        """
+        Poll the status of the given processing job until it completes, fails or the timeout
+        expires. Return the processed blob if the job completed.
+        """
+        started  : float = time.monotonic()
+        deadline : float = started + self.timeout
+        interval : float = POLL_INITIAL
+
+        while True:
+            status : Optional[Dict[str, Any]] = self.get_job_status(job_id)
+            state  : Optional[str]            = status.get("state") if status else None
+
+            if status is not None and state == JOB_COMPLETED and status.get("blob"):
+                processing_time.observe("completed", time.monotonic() - started)
+                return status["blob"]
+
+            if status is not None and state == JOB_FAILED:
+                processing_time.observe("failed", time.monotonic() - started)
+                log.error("Bluesky - Video processing failed: " + str(status.get("error")))
+                return None
+
+            remaining : float = deadline - time.monotonic()
+            if remaining <= 0:
+                processing_time.observe("timeout", time.monotonic() - started)
+                log.error("Bluesky - Timed out waiting for video processing: " + job_id)
+                return None
+
+            time.sleep(min(interval, remaining))
+            interval = min(interval * POLL_FACTOR, POLL_MAXIMUM)
@@ -3,15 +3,23 @@ This module handles parsing of the JSON content data.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
+import json
 
 from src.command.command_queue import command_queue
+from src.command.journal import command_journal
 from src.command.post_highlight import PostHighlight
 from src.command.post_reply import PostReply
-from src.data.highlight import Highlight
+from src.data.game_data import GameData
+from src.data.game_type import GameType
+from src.data.highlight import Highlight, get_fingerprint
+from src.data.period import Period
+from src.game_data_registry import game_data_registry
 from src.highlight_list import HighlightList
 from src.logger import log
+from src.output.video_cache import video_cache
 from src.parser.parser import Parser
+from src.parser.response_cache import get_digest
 
 GAME_CENTER_URL : str = "https://api-web.nhle.com/v1/gamecenter/"
 
@@ -25,17 +33,25 @@ class ContentParser(Parser):
         self.game_id        : int = game_id
         self.highlight_list : HighlightList = HighlightList()
         self.start_time     : datetime = start_time
+        self.scoring_digest : Optional[str] = None
+        self.pending        : bool = False
 
 
     def parse(self) -> None:
         """
         Parse the content page for the current game to determine if there are any new
-        highlights to post.
+        highlights to post. Highlights are built from the landing data fetched here, so each
+        call makes a single request regardless of the number of goals.
+
+        Parsing is skipped entirely when neither the document nor its scoring summary has
+        changed since the last poll. If the scoring summary couldn't be processed, it is kept
+        pending and processed on a later poll even if the document hasn't changed. After this
+        call, the changed flag indicates whether the scoring summary was processed.
         """
 
         self.get_data()
 
-        if self.data is None:
+        if self.data is None or (not self.changed and not self.pending):
             return
 
         scoring_data = self.data.get("summary", {}).get("scoring", None)
@@ -43,24 +59,83 @@ class ContentParser(Parser):
         if scoring_data is None:
             return
 
-        for period in scoring_data:
-            for goal in period.get("goals", {}):
-
-                if "highlightClip" not in goal:
-                    continue
-
-                highlight : Highlight = Highlight(self.game_id, goal)
-                if not self.highlight_list.exists(highlight):
-                    log.info("Adding highlight to list: " + str(highlight.id))
-                    self.highlight_list.add(highlight)
-
-                    if highlight.event is not None:
-                        command_queue.enqueue(PostHighlight(highlight))
-                    else:
-                        log.error("Highlight event is none. Could not enqueue.")
-                else:
-                    previous : Optional[Highlight] = self.highlight_list.get(highlight.id)
-                    if previous is not None and previous.event != highlight.event:
-                        log.info("Updating existing highlight: " + str(highlight.id))
-                        self.highlight_list.update(highlight)
-                        command_queue.enqueue(PostReply(highlight, previous))
+        # The rest of the document (e.g. the game clock) changes constantly while the game is
+        # live, so compare the scoring summary on its own before doing any more work.
+        scoring_digest : str = get_digest(json.dumps(scoring_data).encode("utf-8"))
+        if scoring_digest == self.scoring_digest:
+            self.changed = False
+            return
+
+        game_data : Optional[GameData] = game_data_registry.get(self.game_id)
+
+        if game_data is None:
+            self.pending = True
+            self.changed = False
+            return
+
+        # The summary stays pending until every goal has been parsed, so that a goal that fails
+        # is parsed again on the next poll
+        self.pending = True
+        self.changed = True
+
+        game_type : GameType = GameType(self.data.get("gameType"))
+
+        for per in scoring_data:
+            descriptor : Any    = per.get("periodDescriptor", {})
+            period     : Period = Period(game_type, descriptor)
+
+            for goal in per.get("goals", {}):
+                self.parse_goal(game_data, period, descriptor, goal)
+
+        self.scoring_digest = scoring_digest
+        self.pending        = False
+
+
+    def parse_goal(self,
+                   game_data : GameData,
+                   period : Period,
+                   descriptor : Any,
+                   goal : Any) -> None:
+        """
+        Parse a single goal from the scoring summary, enqueueing a post for a new highlight or a
+        reply for an updated one.
+        """
+
+        if "highlightClip" not in goal:
+            return
+
+        # Skip goals whose data hasn't changed since the last poll
+        highlight_id : int = int(goal["highlightClip"])
+        fingerprint  : int = get_fingerprint(descriptor, goal)
+        if self.highlight_list.is_unchanged(highlight_id, fingerprint):
+            return
+
+        highlight : Highlight = Highlight(self.game_id, game_data, period, goal)
+
+        # After a restart, pick up the state of highlights that were processed before it
+        if not self.highlight_list.exists(highlight):
+            restored : Optional[Highlight] = command_journal.restore_highlight(highlight.id)
+            if restored is not None:
+                self.highlight_list.add(restored)
+
+        if not self.highlight_list.exists(highlight):
+            log.info("Adding highlight to list: " + str(highlight.id))
+            self.highlight_list.add(highlight)
+
+            if highlight.event is not None:
+                video_cache.prefetch(highlight.video)
+                command_queue.enqueue(PostHighlight(highlight))
+            else:
+                log.error("Highlight event is none. Could not enqueue.")
+            command_journal.record_highlight(highlight)
+        else:
+            previous : Optional[Highlight] = self.highlight_list.get(highlight.id)
+            if previous is not None and previous.event != highlight.event:
+                log.info("Updating existing highlight: " + str(highlight.id))
+                highlight.post_id = previous.post_id
+                self.highlight_list.update(highlight)
+                command_queue.enqueue(PostReply(highlight, previous))
+                command_journal.record_highlight(highlight)
+
+        # Only skip this goal on later polls once it has been handled
+        self.highlight_list.set_fingerprint(highlight_id, fingerprint)
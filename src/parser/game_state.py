@@ -7,9 +7,14 @@ from src.parser.parser import Parser
 
 class GameStateParser(Parser):
     """
-    This class defines the parser for game data.
+    This class defines the parser for game data. The game state is checked before every poll,
+    and a failed check is treated as the game still being in progress, so it uses a short
+    timeout and a single retry.
     """
 
+    timeout = 3
+    attempts = 2
+
     def __init__(self, game_id : int):
         super().__init__(game_id, "/play-by-play")
 
@@ -3,7 +3,8 @@ This defines the interface for data parsers.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from dataclasses import replace
+from typing import Any, Dict, Optional
 import time
 import random
 import gzip
@@ -14,6 +15,10 @@ import requests.utils
 import requests.structures
 
 from src.logger import log
+from src.metrics import FAST_BUCKETS, Counter, Histogram, registry
+from src.parser.response_cache import Document, get_digest, get_ttl, response_cache
+from src.parser.single_flight import SingleFlight
+from src.session import http_session
 
 NHL_API_URL: str = "https://api-web.nhle.com/v1/gamecenter/"
 
@@ -30,6 +35,36 @@ BROWSER_HEADERS = {
 
 MAX_ATTEMPTS = 4
 BASE_SLEEP = 0.4
+REQUEST_TIMEOUT = 10
+
+
+api_requests : Counter = registry.register(Counter(
+    "nhl_api_requests_total", "Requests made to the NHL API.", "endpoint"))
+api_retries : Counter = registry.register(Counter(
+    "nhl_api_retries_total", "Failed NHL API requests that were retried.", "endpoint"))
+api_bytes : Counter = registry.register(Counter(
+    "nhl_api_response_bytes_total", "Bytes received from the NHL API.", "endpoint"))
+api_latency : Histogram = registry.register(Histogram(
+    "nhl_api_request_seconds", "Latency of NHL API requests.", "endpoint", FAST_BUCKETS))
+api_decode_time : Histogram = registry.register(Histogram(
+    "nhl_api_decode_seconds", "Time spent decoding NHL API responses.", "endpoint", FAST_BUCKETS))
+
+
+# Concurrent fetches of the same URL share a single request and decoded document
+requests_in_flight : SingleFlight[Document] = SingleFlight()
+
+
+def get_conditional_headers(document: Optional[Document]) -> Dict[str, str]:
+    """
+    Return the request headers, including any validators from the given document.
+    """
+    headers: Dict[str, str] = dict(BROWSER_HEADERS)
+    if document is not None:
+        if document.etag:
+            headers["If-None-Match"] = document.etag
+        if document.last_modified:
+            headers["If-Modified-Since"] = document.last_modified
+    return headers
 
 
 class Parser(ABC):
@@ -37,27 +72,86 @@ class Parser(ABC):
     Base class for NHL API data parsers. Handles retrieval, decoding, retry logic,
     and defensive checks for CDN anomalies. Subclasses implement parse() to convert
     raw API JSON into structured domain-specific objects.
+
+    Requests are made conditionally using the ETag and Last-Modified validators of the
+    last document retrieved from the same URL. When the server responds with 304 Not
+    Modified, or returns an identical body, the previously decoded document is reused
+    and the changed flag is cleared so callers can skip their own processing. Responses
+    are shared through the response cache, which serves them without a request for a
+    short, per-endpoint time after they are fetched.
+
+    Each request times out after timeout seconds and is attempted up to attempts times.
+    Subclasses whose data is polled again shortly can lower these, so that a stalled
+    request doesn't hold a fetch thread for long.
     """
 
+    timeout: float = REQUEST_TIMEOUT
+    attempts: int = MAX_ATTEMPTS
+
     def __init__(self, game_id: int, path: str,
                  base_url: str = NHL_API_URL) -> None:
         self.game_id: int = game_id
         self.url: str = base_url + str(game_id) + path
+        self.endpoint: str = path
+        self.ttl: float = get_ttl(path)
         self.data: Any = {}
+        self.digest: Optional[str] = None
+        self.changed: bool = True
         log.verbose("Parsing from: " + self.url)
 
     def _sleep_backoff(self, attempt: int) -> None:
+        api_retries.inc(self.endpoint)
         sleep_time = BASE_SLEEP * (2 ** (attempt - 1))
         sleep_time += random.uniform(0.05, 0.25)
         time.sleep(sleep_time)
 
-    def _fetch_json_with_retry(self) -> Optional[Any]:
-        for attempt in range(1, MAX_ATTEMPTS + 1):
+    def _decode_json(self, body: bytes) -> Optional[Any]:
+        raw = body
+        if raw.startswith(b"\x1f\x8b\x08"):
+            try:
+                raw = gzip.decompress(raw)
+            except OSError as e:
+                log.error(
+                    f"Gzip decode error from {self.url}: {e}"
+                )
+                return None
+
+        try:
+            text = raw.decode("utf-8")
+        except UnicodeDecodeError as e:
+            snippet = raw[:200].decode(errors="ignore")
+            log.error(
+                f"Unicode decode error from {self.url}: {e} | "
+                f"snippet: {snippet}"
+            )
+            return None
+
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            snippet = text[:200]
+            log.error(
+                f"JSON decode error while pulling data from {self.url}: "
+                f"{e} | snippet: {snippet}"
+            )
+        except ValueError as e:
+            snippet = text[:200]
+            log.error(
+                f"Invalid JSON structure from {self.url}: {e} | "
+                f"snippet: {snippet}"
+            )
+        return None
+
+    def _fetch_json_with_retry(self) -> Optional[Document]:
+        for attempt in range(1, self.attempts + 1):
+            cached = response_cache.lookup(self.url)
+            started = time.monotonic()
+            api_requests.inc(self.endpoint)
             try:
-                resp = requests.get(
+                resp = http_session.get(
                     self.url,
-                    headers=BROWSER_HEADERS,
-                    timeout=10,
+                    headers=get_conditional_headers(cached),
+                    timeout=self.timeout,
                 )
             except requests.exceptions.Timeout:
                 log.error(
@@ -73,7 +167,15 @@ class Parser(ABC):
                 self._sleep_backoff(attempt)
                 continue
 
+            api_latency.observe(self.endpoint, time.monotonic() - started)
+
+            if resp.status_code == 304 and cached is not None:
+                document = replace(cached, fetched_at=time.monotonic())
+                response_cache.put(self.url, document)
+                return document
+
             body = resp.content
+            api_bytes.inc(self.endpoint, len(body))
             if not body or len(body) < 50:
                 log.error(
                     f"Body too small ({len(body)} bytes) while pulling data "
@@ -82,46 +184,24 @@ class Parser(ABC):
                 self._sleep_backoff(attempt)
                 continue
 
-            raw = body
-            if raw.startswith(b"\x1f\x8b\x08"):
-                try:
-                    raw = gzip.decompress(raw)
-                except OSError as e:
-                    log.error(
-                        f"Gzip decode error from {self.url}: {e}"
-                    )
+            digest = get_digest(body)
+            if cached is not None and digest == cached.digest:
+                result = cached.data
+            else:
+                started = time.monotonic()
+                result = self._decode_json(body)
+                api_decode_time.observe(self.endpoint, time.monotonic() - started)
+                if result is None:
                     self._sleep_backoff(attempt)
                     continue
 
-            try:
-                text = raw.decode("utf-8")
-            except UnicodeDecodeError as e:
-                snippet = raw[:200].decode(errors="ignore")
-                log.error(
-                    f"Unicode decode error from {self.url}: {e} | "
-                    f"snippet: {snippet}"
-                )
-                self._sleep_backoff(attempt)
-                continue
-
-            try:
-                return json.loads(text)
-            except json.JSONDecodeError as e:
-                snippet = text[:200]
-                log.error(
-                    f"JSON decode error while pulling data from {self.url}: "
-                    f"{e} | snippet: {snippet}"
-                )
-                self._sleep_backoff(attempt)
-                continue
-            except ValueError as e:
-                snippet = text[:200]
-                log.error(
-                    f"Invalid JSON structure from {self.url}: {e} | "
-                    f"snippet: {snippet}"
-                )
-                self._sleep_backoff(attempt)
-                continue
+            document = Document(result,
+                                digest,
+                                resp.headers.get("ETag"),
+                                resp.headers.get("Last-Modified"),
+                                len(body))
+            response_cache.put(self.url, document)
+            return document
 
         log.error(f"All attempts to fetch data from {self.url} failed.")
         return None
@@ -130,14 +210,23 @@ class Parser(ABC):
         """
         Retrieve JSON data for the associated game. Handles retries, CDN anomalies,
         decode failures, and assigns the parsed result to self.data. If retrieval
-        fails after all attempts, self.data is set to an empty dict.
+        fails after all attempts, self.data is set to an empty dict. The changed flag
+        indicates whether the document differs from the one retrieved by the last call.
+        Fresh responses are served from the cache, and requests for the same URL made at
+        the same time share a single fetch.
         """
-        result = self._fetch_json_with_retry()
-        if result is None:
+        document = response_cache.get(self.url, self.ttl)
+        if document is None:
+            document = requests_in_flight.do(self.url, self._fetch_json_with_retry)
+        if document is None:
             log.error(f"Game data is null for game: {self.game_id}")
             self.data = {}
+            self.digest = None
+            self.changed = True
         else:
-            self.data = result
+            self.data = document.data
+            self.changed = document.digest != self.digest
+            self.digest = document.digest
 
     @abstractmethod
     def parse(self):
@@ -0,0 +1,153 @@
+"""
+This module defines the shared cache of decoded API responses.
+"""
+
+import hashlib
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from src.metrics import Callback, CounterCallback, registry
+
+# The maximum number of response body bytes held by the cache
+MAX_BYTES : int = 32 * 1024 * 1024
+
+# The number of seconds a response remains fresh, by endpoint. The live endpoints are polled every
+# few seconds, so they are only cached long enough to absorb duplicate requests. The schedule does
+# not change over the course of the day.
+DEFAULT_TTL : float = 2.0
+ENDPOINT_TTLS : Dict[str, float] = {
+    "/landing":      2.0,
+    "/play-by-play": 2.0,
+    "/schedule":     3600.0,
+}
+
+
+def get_digest(content : bytes) -> str:
+    """
+    Return a digest of the given content, used to detect whether a document has changed.
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+def get_ttl(endpoint : str) -> float:
+    """
+    Return the number of seconds that a response from the given endpoint remains fresh.
+    """
+    return ENDPOINT_TTLS.get(endpoint, DEFAULT_TTL)
+
+
+@dataclass
+class Document:
+    """
+    A decoded API response, along with the digest of its body and the validators used to
+    request it conditionally.
+    """
+
+    data          : Any
+    digest        : str
+    etag          : Optional[str] = None
+    last_modified : Optional[str] = None
+    size          : int           = 0
+    fetched_at    : float         = field(default_factory=time.monotonic)
+
+
+class ResponseCache:
+    """
+    This class defines an in-process cache of decoded API responses, keyed by URL. Responses are
+    served directly while they are fresh. Stale responses are kept so that their validators can be
+    used to make conditional requests, until they are evicted in least recently used order to keep
+    the cache within its byte budget.
+    """
+
+    def __init__(self, max_bytes : int = MAX_BYTES) -> None:
+        self.max_bytes : int                        = max_bytes
+        self.documents : OrderedDict[str, Document] = OrderedDict()
+        self.size      : int                        = 0
+        self.hits      : int                        = 0
+        self.misses    : int                        = 0
+        self.lock      : Lock                       = Lock()
+
+
+    def get(self, url : str, ttl : float) -> Optional[Document]:
+        """
+        Return the document for the given URL if it was fetched within the given number of
+        seconds, and record the cache hit or miss.
+        """
+        with self.lock:
+            document : Optional[Document] = self.documents.get(url)
+            if document is None or time.monotonic() - document.fetched_at >= ttl:
+                self.misses += 1
+                return None
+            self.documents.move_to_end(url)
+            self.hits += 1
+            return document
+
+
+    def lookup(self, url : str) -> Optional[Document]:
+        """
+        Return the last document retrieved from the given URL, regardless of its age.
+        """
+        with self.lock:
+            return self.documents.get(url)
+
+
+    def put(self, url : str, document : Document) -> None:
+        """
+        Store the document retrieved from the given URL, evicting the least recently used
+        documents if the cache exceeds its byte budget.
+        """
+        with self.lock:
+            previous : Optional[Document] = self.documents.pop(url, None)
+            if previous is not None:
+                self.size -= previous.size
+            self.documents[url] = document
+            self.size += document.size
+            while self.size > self.max_bytes and len(self.documents) > 1:
+                _, evicted = self.documents.popitem(last=False)
+                self.size -= evicted.size
+
+
+    def clear(self) -> None:
+        """
+        Clear all cached documents.
+        """
+        with self.lock:
+            self.documents = OrderedDict()
+            self.size      = 0
+
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the cache counters.
+        """
+        with self.lock:
+            return {
+                "documents": len(self.documents),
+                "bytes":     self.size,
+                "hits":      self.hits,
+                "misses":    self.misses,
+            }
+
+
+def register_metrics(cache : ResponseCache) -> None:
+    """
+    Register the metrics for the given cache, so they are exported by the application.
+    """
+    registry.register(CounterCallback("response_cache_requests_total",
+                                      "Cache lookups for fresh API responses.",
+                                      "result",
+                                      lambda: {"hit":  cache.hits,
+                                               "miss": cache.misses}))
+    registry.register(Callback("response_cache_size",
+                               "Responses held by the cache.",
+                               "unit",
+                               lambda: {"documents": len(cache.documents),
+                                        "bytes":     cache.size}))
+
+
+response_cache = ResponseCache()
+register_metrics(response_cache)
@@ -0,0 +1,86 @@
+"""
+This module coalesces concurrent requests for the same resource into a single call.
+"""
+
+import time
+from threading import Event, Lock
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+# The number of seconds for which a completed result is shared with new callers
+FRESHNESS_WINDOW : float = 1.0
+
+
+# pylint: disable=too-few-public-methods
+class Call(Generic[T]):
+    """
+    A call that is either in flight or has recently completed.
+    """
+
+    def __init__(self) -> None:
+        self.done        : Event           = Event()
+        self.result      : Optional[T]     = None
+        self.finished_at : Optional[float] = None
+
+
+    def is_fresh(self, window : float) -> bool:
+        """
+        Return a boolean indicating whether or not the call is in flight or completed within the
+        given window.
+        """
+        return self.finished_at is None or time.monotonic() - self.finished_at < window
+
+
+class SingleFlight(Generic[T]):
+    """
+    This class ensures that only one call per key is in flight at a time. Callers that ask for a
+    key while it is in flight wait for and share its result. Successful results are also shared
+    with callers that arrive within the freshness window after the call has completed.
+    """
+
+    def __init__(self, window : float = FRESHNESS_WINDOW) -> None:
+        self.window : float              = window
+        self.calls  : Dict[str, Call[T]] = {}
+        self.lock   : Lock               = Lock()
+
+
+    def do(self, key : str, function : Callable[[], Optional[T]]) -> Optional[T]:
+        """
+        Return the result of the given function, sharing the call with any other callers that
+        use the same key.
+        """
+        with self.lock:
+            self.prune()
+            call : Optional[Call[T]] = self.calls.get(key)
+            if call is not None:
+                is_owner : bool = False
+            else:
+                call = Call()
+                self.calls[key] = call
+                is_owner = True
+
+        if not is_owner:
+            call.done.wait()
+            return call.result
+
+        try:
+            call.result = function()
+        finally:
+            with self.lock:
+                call.finished_at = time.monotonic()
+                # Failures are only shared with callers that were already waiting
+                if call.result is None:
+                    del self.calls[key]
+            call.done.set()
+
+        return call.result
+
+
+    def prune(self) -> None:
+        """
+        Remove completed calls that are older than the freshness window. The lock must be held.
+        """
+        stale = [key for key, call in self.calls.items() if not call.is_fresh(self.window)]
+        for key in stale:
+            del self.calls[key]
@@ -12,6 +12,8 @@ import pytz
 import requests
 
 from src.logger import log
+from src.parser.response_cache import Document, get_digest, get_ttl, response_cache
+from src.session import http_session
 
 # NHL API URL
 SCHEDULE_API : str = "https://api-web.nhle.com/v1/schedule"
@@ -79,23 +81,37 @@ def get_morning() -> datetime:
 def get_schedule_json() -> Optional[Any]:
     """
     Return the JSON record describing the team's games that are
-    scheduled today.
+    scheduled today. The record is cached, so repeated calls over the
+    course of the day do not fetch it again. Failed responses are not
+    cached.
     """
 
     date   : datetime = get_current_date()
     url    : str      = SCHEDULE_API + "/" + date_to_string(date)
     params : str      = ""
 
+    cached : Optional[Document] = response_cache.get(url, get_ttl("/schedule"))
+    if cached is not None:
+        return cached.data
+
     log.verbose("getting schedule JSON from: " + url)
     try:
-        request = requests.get(url, params, timeout=5)
+        request = http_session.get(url, params=params, timeout=5)
     except requests.exceptions.Timeout:
         log.error("Timeout occurred while pulling schedule data from: " + url)
         return None
     except requests.exceptions.ConnectionError:
         log.error("Connection error occurred while pulling schedule data from: " + url)
         return None
-    return request.json()
+
+    if not request.ok:
+        log.error("Could not get schedule data from: " + url + " (" +
+                  str(request.status_code) + ")")
+        return None
+
+    data : Any = request.json()
+    response_cache.put(url, Document(data, get_digest(request.content), size=len(request.content)))
+    return data
 
 
 def get_game_id() -> Optional[int]:
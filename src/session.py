@@ -0,0 +1,42 @@
+"""
+This module provides the shared HTTP session used for all NHL API requests.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# The number of hosts to keep connection pools for, and the number of connections to keep alive
+# for each host. Every game thread polls the same host, so the pool size should be at least the
+# number of games that may be tracked at once.
+POOL_CONNECTIONS : int = 4
+POOL_SIZE        : int = 20
+
+# Retries performed by the adapter itself. These only cover failures to connect, such as a pooled
+# connection that was closed by the server. Read errors and bad responses are retried by the
+# parsers, which apply their own backoff.
+CONNECT_RETRIES : int   = 2
+BACKOFF_FACTOR  : float = 0.2
+
+
+def create_session(pool_connections : int = POOL_CONNECTIONS,
+                   pool_size : int = POOL_SIZE) -> requests.Session:
+    """
+    Create a session that keeps connections alive and pools them per host. Connection pools are
+    thread-safe, so the session can be shared by every thread that makes requests.
+    """
+    retries = Retry(total=CONNECT_RETRIES,
+                    connect=CONNECT_RETRIES,
+                    read=0,
+                    status=0,
+                    backoff_factor=BACKOFF_FACTOR)
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_size,
+                          max_retries=retries)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+http_session : requests.Session = create_session()
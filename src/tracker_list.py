@@ -0,0 +1,44 @@
+"""
+This module defines the list of game trackers.
+"""
+
+from typing import List
+from src.game_tracker import GameTracker
+
+class TrackerList:
+    """
+    This class defines the list of game trackers.
+    """
+
+    def __init__(self) -> None:
+        self.trackers : List[GameTracker] = []
+
+    def set(self, trackers : List[GameTracker]) -> None:
+        """
+        Set the stored list of game trackers.
+        """
+        self.trackers = trackers
+
+    def append(self, tracker : GameTracker) -> None:
+        """
+        Append a tracker to the list of game trackers.
+        """
+        self.trackers.append(tracker)
+
+    def clear(self) -> None:
+        """
+        Clear the list of game trackers.
+        """
+        self.trackers = []
+
+    def get(self) -> List[GameTracker]:
+        """
+        Return the list of game trackers.
+        """
+        return self.trackers
+
+    def is_empty(self) -> bool:
+        """
+        Return a boolean indicating whether or not the list of game trackers is empty.
+        """
+        return len(self.trackers) <= 0
@@ -0,0 +1,274 @@
+"""
+TODO
+"""
+
+import threading
+import time
+import unittest
+from typing import List, Optional
+
+from src.command.command import Command, Priority
+from src.command.command_queue import CommandQueue, State
+
+# pylint: disable=too-few-public-methods
+class Record(Command):
+    """
+    A command that records its name when executed.
+    """
+
+    def __init__(self,
+                 name : str,
+                 priority : Priority,
+                 executed : List[str],
+                 pool : Optional[str] = "default",
+                 ordering_key : Optional[str] = None,
+                 duration : float = 0):
+        super().__init__(name, priority, pool, ordering_key)
+        self.executed : List[str] = executed
+        self.duration : float     = duration
+
+    def execute(self) -> None:
+        time.sleep(self.duration)
+        self.executed.append(self.name)
+
+
+class Reply(Record):
+    """
+    A command that is coalesced with other replies for the same highlight.
+    """
+
+    def __init__(self, name : str, executed : List[str]):
+        super().__init__(name, Priority.REPLY, executed)
+        self.merged : List[str] = []
+
+    def get_coalescing_key(self) -> Optional[str]:
+        return "reply-1"
+
+    def merge(self, older : Command) -> None:
+        self.merged.append(older.name)
+
+
+class TestCommandQueue(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def test_priority_order(self):
+        """
+        TODO
+        """
+        executed : List[str] = []
+        queue = CommandQueue()
+        queue.enqueue(Record("reply", Priority.REPLY, executed))
+        queue.enqueue(Record("first", Priority.POST, executed))
+        queue.enqueue(Record("second", Priority.POST, executed))
+        queue.enqueue(Record("health", Priority.HEALTH, executed))
+        queue.stop()
+        queue.enqueue(Record("status", Priority.HOUSEKEEPING, executed))
+        queue.start()
+        assert executed == ["health", "first", "second", "reply"]
+        assert queue.state == State.STOPPED
+
+
+    def test_blocking_dequeue(self):
+        """
+        TODO
+        """
+        executed : List[str] = []
+        queue = CommandQueue()
+        thread = threading.Thread(target=queue.start)
+        thread.start()
+        time.sleep(0.1)
+        queue.enqueue(Record("late", Priority.POST, executed))
+        queue.stop()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        assert executed == ["late"]
+
+
+    def test_dequeue_timeout(self):
+        """
+        TODO
+        """
+        queue = CommandQueue()
+        assert queue.dequeue(block=True, timeout=0.01) is None
+        assert queue.empty()
+
+
+    def test_fifo_within_priority(self):
+        """
+        TODO
+        """
+        executed : List[str] = []
+        queue = CommandQueue()
+        names = [str(index) for index in range(100)]
+        for name in names:
+            queue.enqueue(Record(name, Priority.POST, executed))
+        queue.stop()
+        queue.start()
+        assert executed == names
+
+
+    def test_slow_media_does_not_block_health(self):
+        """
+        TODO
+        """
+        executed : List[str] = []
+        queue = CommandQueue({"media": 1, "health": 1})
+        thread = threading.Thread(target=queue.start)
+        thread.start()
+        queue.enqueue(Record("upload", Priority.POST, executed, pool="media", duration=0.5))
+        time.sleep(0.1)
+        queue.enqueue(Record("health", Priority.HEALTH, executed, pool="health"))
+        time.sleep(0.1)
+        assert executed == ["health"]
+        queue.stop()
+        thread.join(timeout=5)
+        assert executed == ["health", "upload"]
+
+
+    def test_ordering_key_across_pools(self):
+        """
+        TODO
+        """
+        executed : List[str] = []
+        queue = CommandQueue({"media": 1, "text": 1})
+        queue.enqueue(Record("post", Priority.POST, executed, pool="media",
+                             ordering_key="highlight-1", duration=0.3))
+        queue.enqueue(Record("reply", Priority.REPLY, executed, pool="text",
+                             ordering_key="highlight-1"))
+        queue.enqueue(Record("other", Priority.REPLY, executed, pool="text",
+                             ordering_key="highlight-2"))
+        queue.stop()
+        queue.start()
+        assert executed == ["other", "post", "reply"]
+
+
+    def test_failure_does_not_stop_queue(self):
+        """
+        TODO
+        """
+        executed : List[str] = []
+        queue = CommandQueue()
+        failing = Record("failing", Priority.POST, executed)
+        failing.execute = lambda: 1 / 0
+        queue.enqueue(failing)
+        queue.enqueue(Record("after", Priority.POST, executed))
+        queue.stop()
+        queue.start()
+        assert executed == ["after"]
+
+
+    def test_expired_command_is_dropped(self):
+        """
+        TODO
+        """
+        executed : List[str] = []
+        queue = CommandQueue()
+        stale = Record("stale", Priority.POST, executed)
+        stale.max_age = 0.01
+        queue.enqueue(stale)
+        queue.enqueue(Record("fresh", Priority.POST, executed))
+        time.sleep(0.05)
+        queue.stop()
+        queue.start()
+        assert executed == ["fresh"]
+        assert queue.expired == 1
+
+
+    def test_overdue_command_is_abandoned(self):
+        """
+        TODO
+        """
+        executed : List[str] = []
+        queue = CommandQueue({"media": 1})
+        stuck = Record("stuck", Priority.POST, executed, pool="media",
+                       ordering_key="highlight-1", duration=3)
+        stuck.timeout = 0.1
+        queue.enqueue(stuck)
+        queue.enqueue(Record("next", Priority.POST, executed, pool="media",
+                             ordering_key="highlight-1"))
+        queue.stop()
+        queue.start()
+        assert executed == ["next"]
+        assert stuck.is_cancelled()
+        assert queue.timed_out == 1
+
+
+    def test_queued_commands_move_to_new_pool(self):
+        """
+        TODO
+        """
+        executed : List[str] = []
+        queue = CommandQueue({"text": 1})
+        stuck = Record("stuck", Priority.POST, executed, pool="text", duration=3)
+        stuck.timeout = 0.2
+        queue.enqueue(stuck)
+        queue.enqueue(Record("quick", Priority.POST, executed, pool="text"))
+        queue.stop()
+
+        started : float = time.monotonic()
+        queue.start()
+        assert executed == ["quick"]
+        assert time.monotonic() - started < 2
+        assert stuck.is_cancelled()
+
+
+    def test_pending_replies_are_coalesced(self):
+        """
+        TODO
+        """
+        executed : List[str] = []
+        queue  = CommandQueue()
+        first  = Reply("first", executed)
+        second = Reply("second", executed)
+        queue.enqueue(first)
+        queue.enqueue(second)
+        queue.stop()
+        queue.start()
+        assert executed == ["second"]
+        assert second.merged == ["first"]
+        assert first.is_cancelled()
+        assert queue.coalesced == 1
+
+
+    def test_started_reply_is_not_coalesced(self):
+        """
+        TODO
+        """
+        executed : List[str] = []
+        queue  = CommandQueue()
+        first  = Reply("first", executed)
+        queue.enqueue(first)
+        queue.stop()
+        queue.start()
+        second = Reply("second", executed)
+        queue.enqueue(second)
+        queue.stop()
+        queue.start()
+        assert executed == ["first", "second"]
+        assert not second.merged
+
+
+    def test_stats(self):
+        """
+        TODO
+        """
+        executed : List[str] = []
+        queue = CommandQueue()
+        queue.enqueue(Record("post", Priority.POST, executed))
+        queue.enqueue(Record("reply", Priority.REPLY, executed))
+        failing = Record("failure", Priority.REPLY, executed)
+        failing.execute = lambda: 1 / 0
+        queue.enqueue(failing)
+        stats = queue.stats()
+        assert stats["depth"]["POST"] == 1
+        assert stats["depth"]["REPLY"] == 2
+
+        queue.stop()
+        queue.start()
+        stats = queue.stats()
+        assert stats["depth"]["REPLY"] == 0
+        assert stats["wait_time"]["post"]["count"] == 1
+        assert stats["run_time"]["reply"]["count"] == 1
+        assert stats["failures"] == {"failure": 1}
@@ -0,0 +1,167 @@
+"""
+TODO
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from typing import Any, Dict, List, Optional
+
+from src.command.command import Command, Priority
+from src.command.command_queue import CommandQueue
+from src.command.journal import Journal
+
+executed : List[str] = []
+
+# pylint: disable=too-few-public-methods
+class Durable(Command):
+    """
+    A command that records its name when executed, and can be restored from the journal.
+    """
+
+    max_age = 60
+
+    def __init__(self, name : str):
+        super().__init__(name, Priority.POST)
+
+    def to_record(self) -> Optional[Dict[str, Any]]:
+        return {"name": self.name}
+
+    @classmethod
+    def from_record(cls, record : Dict[str, Any]) -> Optional[Command]:
+        return cls(record["name"])
+
+    def execute(self) -> None:
+        executed.append(self.name)
+
+
+class Correction(Durable):
+    """
+    A durable command that is coalesced with older corrections, keeping their names.
+    """
+
+    def get_coalescing_key(self) -> Optional[str]:
+        return "correction"
+
+    def merge(self, older : Command) -> None:
+        self.name = older.name + "," + self.name
+
+
+class TestJournal(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with
+        self.path      = os.path.join(self.directory.name, "journal")
+        executed.clear()
+
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+    def test_unfinished_commands_are_restored(self):
+        """
+        TODO
+        """
+        journal  = Journal(self.path)
+        first    = Durable("first")
+        second   = Durable("second")
+        journal.record_enqueued(first)
+        journal.record_enqueued(second)
+        journal.record_finished(first)
+
+        restored = Journal(self.path).open()
+        assert [command.name for command in restored] == ["second"]
+
+
+    def test_restored_commands_keep_their_age(self):
+        """
+        TODO
+        """
+        record = {"op":   "enqueue",
+                  "id":   0,
+                  "type": "Durable",
+                  "time": time.time() - 3600,
+                  "data": {"name": "old"}}
+        with open(self.path, "w", encoding="utf-8") as journal_file:
+            journal_file.write(json.dumps(record) + "\n")
+
+        restored = Journal(self.path).open()
+        assert len(restored) == 1
+        assert restored[0].is_expired()
+
+
+    def test_journal_is_compacted_on_open(self):
+        """
+        TODO
+        """
+        journal = Journal(self.path)
+        for index in range(10):
+            command = Durable(str(index))
+            journal.record_enqueued(command)
+            journal.record_finished(command)
+        journal.record_enqueued(Durable("pending"))
+
+        Journal(self.path).open()
+        with open(self.path, encoding="utf-8") as journal_file:
+            assert len(journal_file.readlines()) == 1
+
+
+    def test_incomplete_record_is_ignored(self):
+        """
+        TODO
+        """
+        journal = Journal(self.path)
+        journal.record_enqueued(Durable("complete"))
+        with open(self.path, "a", encoding="utf-8") as journal_file:
+            journal_file.write('{"op": "enqueue", "id": 1, "ty')
+
+        restored = Journal(self.path).open()
+        assert [command.name for command in restored] == ["complete"]
+
+
+    def test_restored_commands_are_not_recorded_twice(self):
+        """
+        TODO
+        """
+        journal = Journal(self.path)
+        journal.record_enqueued(Durable("pending"))
+
+        journal = Journal(self.path)
+        queue   = CommandQueue(journal=journal)
+        for command in journal.open():
+            queue.enqueue(command)
+        queue.stop()
+        queue.start()
+
+        assert executed == ["pending"]
+        assert not Journal(self.path).open()
+
+
+    def test_coalesced_command_is_recorded_after_merge(self):
+        """
+        TODO
+        """
+        queue = CommandQueue(journal=Journal(self.path))
+        queue.enqueue(Correction("first"))
+        queue.enqueue(Correction("second"))
+
+        # The older correction is only marked as finished once it is dequeued, and is coalesced
+        # again when the commands are restored
+        restored = Journal(self.path).open()
+        assert restored[-1].name == "first,second"
+
+
+    def test_disabled_journal(self):
+        """
+        TODO
+        """
+        journal = Journal("")
+        journal.record_enqueued(Durable("pending"))
+        assert not journal.open()
+        assert not os.path.exists(self.path)
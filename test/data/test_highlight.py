@@ -0,0 +1,121 @@
+"""
+TODO
+"""
+
+import json
+import unittest
+from typing import Any, Optional
+
+from src.data.game_data import GameData
+from src.data.game_type import GameType
+from src.data.highlight import Highlight, get_fingerprint, load_highlight
+from src.data.period import Period
+
+GAME : Any = {
+    "homeTeam": {"abbrev": "TOR", "commonName": {"default": "Maple Leafs"}},
+    "awayTeam": {"abbrev": "MTL", "commonName": {"default": "Canadiens"}},
+    "startTimeUTC": "2024-10-09T23:00:00Z",
+    "venue": "Scotiabank Arena",
+    "gameType": 2
+}
+
+GOAL : Any = {
+    "highlightClip": 6363688917112,
+    "firstName": {"default": "Auston"},
+    "lastName": {"default": "Matthews"},
+    "teamAbbrev": {"default": "TOR"},
+    "timeInPeriod": "05:30",
+    "strength": "ev",
+    "homeScore": 1,
+    "awayScore": 0,
+    "assists": [
+        {
+            "firstName": {"default": "Mitch"},
+            "lastName": {"default": "Marner"}
+        }
+    ]
+}
+
+class TestHighlight(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def test_event_from_goal(self):
+        """
+        TODO
+        """
+        period    : Period    = Period(GameType.REGULAR_SEASON, {"number": 1, "periodType": "REG"})
+        highlight : Highlight = Highlight(2024020001, GameData(GAME), period, GOAL)
+        assert highlight.id == 6363688917112
+        assert highlight.goal_id == 1
+        assert highlight.event is not None
+        assert highlight.event.scorer == "Auston Matthews"
+        assert highlight.event.primary_assist == "Mitch Marner"
+        assert highlight.event.time == "14:30"
+
+
+    def test_post_from_goal(self):
+        """
+        TODO
+        """
+        period    : Period        = Period(GameType.REGULAR_SEASON, {"number": 1, "periodType": "REG"})
+        highlight : Highlight     = Highlight(2024020001, GameData(GAME), period, GOAL)
+        post      : Optional[str] = highlight.get_post()
+        assert post is not None
+        assert post.startswith("Toronto goal!")
+        assert "Toronto: 1\nMontreal: 0" in post
+
+
+    def test_no_game_data(self):
+        """
+        TODO
+        """
+        period    : Period    = Period(GameType.REGULAR_SEASON, {"number": 1, "periodType": "REG"})
+        highlight : Highlight = Highlight(2024020001, None, period, GOAL)
+        assert highlight.event is None
+        assert highlight.get_post() is None
+
+
+    def test_fingerprint_unchanged(self):
+        """
+        TODO
+        """
+        period : Any = {"number": 1, "periodType": "REG"}
+        assert get_fingerprint(period, GOAL) == get_fingerprint(period, dict(GOAL))
+
+
+    def test_fingerprint_assist_changed(self):
+        """
+        TODO
+        """
+        period  : Any = {"number": 1, "periodType": "REG"}
+        updated : Any = dict(GOAL)
+        updated["assists"] = [{"firstName": {"default": "William"},
+                               "lastName": {"default": "Nylander"}}]
+        assert get_fingerprint(period, GOAL) != get_fingerprint(period, updated)
+
+
+    def test_fingerprint_time_changed(self):
+        """
+        TODO
+        """
+        period  : Any = {"number": 1, "periodType": "REG"}
+        updated : Any = dict(GOAL)
+        updated["timeInPeriod"] = "05:31"
+        assert get_fingerprint(period, GOAL) != get_fingerprint(period, updated)
+
+
+    def test_record_round_trip(self):
+        """
+        TODO
+        """
+        period    : Period    = Period(GameType.REGULAR_SEASON, {"number": 2, "periodType": "REG"})
+        highlight : Highlight = Highlight(2024020001, GameData(GAME), period, GOAL)
+        highlight.post_id["Bluesky"] = {"uri": "at://post", "cid": "cid"}
+        record    : Any       = json.loads(json.dumps(highlight.to_record()))
+        restored  : Highlight = load_highlight(record, GameData(GAME))
+        assert restored.id == highlight.id
+        assert restored.event == highlight.event
+        assert restored.post_id == highlight.post_id
+        assert restored.get_post() == highlight.get_post()
@@ -0,0 +1,167 @@
+"""
+TODO
+"""
+
+import base64
+import io
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Set
+
+from src.output.token_manager import TokenManager, get_expiry
+
+
+def make_token(name : str, lifetime : float) -> str:
+    """
+    Return an unsigned JWT with the given name and lifetime in seconds.
+    """
+    claims  = json.dumps({"sub": name, "exp": int(time.time() + lifetime)}).encode()
+    payload = base64.urlsafe_b64encode(claims).decode().rstrip("=")
+    return "header." + payload + ".signature"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    A stand-in for the Bluesky API that issues and checks access tokens.
+    """
+
+    calls    : List[str] = []
+    bodies   : List[int] = []
+    rejected : Set[str]  = set()
+    lifetime : float     = 3600
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        Respond to session and record requests.
+        """
+        endpoint = self.path.rsplit("/", 1)[-1]
+        StandInHandler.calls.append(endpoint)
+        StandInHandler.bodies.append(len(self.rfile.read(int(self.headers.get("Content-Length",
+                                                                              0)))))
+        token = self.headers.get("Authorization", "").replace("Bearer ", "")
+
+        if endpoint in ("com.atproto.server.createSession", "com.atproto.server.refreshSession"):
+            name = str(len(StandInHandler.calls))
+            self.respond(200, {"did": "did:plc:bot",
+                               "accessJwt": make_token("access" + name, StandInHandler.lifetime),
+                               "refreshJwt": make_token("refresh" + name, 86400)})
+        elif token in StandInHandler.rejected:
+            self.respond(400, {"error": "ExpiredToken"})
+        else:
+            self.respond(200, {"uri": "at://post", "cid": "cid"})
+
+    def respond(self, status, body):
+        """
+        Send the given JSON response.
+        """
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *_args):
+        """
+        Silence request logging.
+        """
+
+
+class TestTokenManager(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def setUp(self):
+        StandInHandler.calls    = []
+        StandInHandler.bodies   = []
+        StandInHandler.rejected = set()
+        StandInHandler.lifetime = 3600
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.tokens = TokenManager("handle", "password",
+                                   "http://127.0.0.1:" + str(self.server.server_port) + "/")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+    def test_expiry(self):
+        """
+        TODO
+        """
+        token = make_token("access", 60)
+        assert abs(get_expiry(token) - (time.time() + 60)) < 2
+        assert get_expiry("not a token") == 0
+
+
+    def test_session_is_reused(self):
+        """
+        TODO
+        """
+        for _ in range(3):
+            response = self.tokens.send("POST", "com.atproto.repo.createRecord", json={})
+            assert response is not None and response.ok
+        assert StandInHandler.calls.count("com.atproto.server.createSession") == 1
+        assert StandInHandler.calls.count("com.atproto.repo.createRecord") == 3
+
+
+    def test_expired_session_is_refreshed(self):
+        """
+        TODO
+        """
+        StandInHandler.lifetime = 0
+        self.tokens.send("POST", "com.atproto.repo.createRecord", json={})
+        self.tokens.send("POST", "com.atproto.repo.createRecord", json={})
+        assert StandInHandler.calls.count("com.atproto.server.createSession") == 1
+        assert StandInHandler.calls.count("com.atproto.server.refreshSession") == 1
+
+
+    def test_rejected_token_is_refreshed(self):
+        """
+        TODO
+        """
+        session = self.tokens.get_session()
+        assert session is not None
+        StandInHandler.rejected.add(session["accessJwt"])
+        response = self.tokens.send("POST", "com.atproto.repo.createRecord", json={})
+        assert response is not None and response.ok
+        assert StandInHandler.calls == ["com.atproto.server.createSession",
+                                        "com.atproto.repo.createRecord",
+                                        "com.atproto.server.refreshSession",
+                                        "com.atproto.repo.createRecord"]
+
+
+    def test_shared_across_threads(self):
+        """
+        TODO
+        """
+        def post():
+            self.tokens.send("POST", "com.atproto.repo.createRecord", json={})
+        threads = [threading.Thread(target=post) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert StandInHandler.calls.count("com.atproto.server.createSession") == 1
+        assert StandInHandler.calls.count("com.atproto.repo.createRecord") == 8
+
+
+    def test_upload_is_rewound_on_retry(self):
+        """
+        TODO
+        """
+        session = self.tokens.get_session()
+        assert session is not None
+        StandInHandler.rejected.add(session["accessJwt"])
+        data     = b"video" * 1000
+        response = self.tokens.send("POST", "com.atproto.repo.uploadBlob",
+                                    headers={"Content-Length": str(len(data))},
+                                    data=io.BytesIO(data))
+        assert response is not None and response.ok
+        assert StandInHandler.bodies[1:] == [len(data), 0, len(data)]
@@ -0,0 +1,174 @@
+"""
+TODO
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from typing import List, Optional
+
+from src.output.video_cache import VideoCache, get_filename, get_key
+
+URL : str = "https://players.brightcove.net/6415718365001/EXtG1xJ7H_default/index.html?videoId="
+
+
+class StandInCache(VideoCache):
+    """
+    A cache that writes a file of a fixed size instead of downloading a video.
+    """
+
+    def __init__(self, directory : str, budget : int) -> None:
+        super().__init__(directory, budget, workers=2)
+        self.release   : threading.Event = threading.Event()
+        self.downloads : List[str]       = []
+        self.failures  : int             = 0
+        self.release.set()
+
+
+    def download(self, url : str) -> Optional[str]:
+        self.release.wait()
+        self.downloads.append(url)
+        if self.failures > 0:
+            self.failures -= 1
+            return None
+        filename : str = os.path.join(self.directory, get_filename(url))
+        with open(filename, "wb") as video_file:
+            video_file.write(b"v" * 10)
+        with self.lock:
+            self.sizes[get_key(url)] = 10
+            self.evict()
+        return filename
+
+
+class TestVideoCache(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+
+    def path(self, key : str) -> str:
+        """
+        Return the path of the cached video with the given key.
+        """
+        return os.path.join(self.directory.name, "highlight" + key + ".mp4")
+
+
+    def test_get_filename(self):
+        """
+        TODO
+        """
+        assert get_key(URL + "6349271540112") == "6349271540112"
+        assert get_filename(URL + "6349271540112") == "highlight6349271540112.mp4"
+
+
+    def test_download_once(self):
+        """
+        TODO
+        """
+        cache = StandInCache(self.directory.name, budget=100)
+        cache.prefetch(URL + "1")
+        with cache.open(URL + "1") as filename:
+            assert filename == self.path("1")
+        with cache.open(URL + "1") as filename:
+            assert filename == self.path("1")
+        assert os.path.exists(self.path("1"))
+        assert cache.downloads == [URL + "1"]
+
+
+    def test_concurrent_requests(self):
+        """
+        TODO
+        """
+        cache = StandInCache(self.directory.name, budget=100)
+        cache.release.clear()
+        results : List[Optional[str]] = []
+
+        def upload():
+            with cache.open(URL + "1") as filename:
+                results.append(filename)
+
+        threads = [threading.Thread(target=upload) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        cache.release.set()
+        for thread in threads:
+            thread.join()
+        assert results == [self.path("1")] * 3
+        assert cache.downloads == [URL + "1"]
+
+
+    def test_failed_download_is_retried(self):
+        """
+        TODO
+        """
+        cache = StandInCache(self.directory.name, budget=100)
+        cache.failures = 1
+        with cache.open(URL + "1") as filename:
+            assert filename is None
+        with cache.open(URL + "1") as filename:
+            assert filename == self.path("1")
+        assert cache.downloads == [URL + "1", URL + "1"]
+
+
+    def test_eviction(self):
+        """
+        TODO
+        """
+        cache = StandInCache(self.directory.name, budget=25)
+        for key in ["1", "2"]:
+            with cache.open(URL + key):
+                pass
+
+        # Using the first video makes the second the least recently used
+        with cache.open(URL + "1"):
+            pass
+        with cache.open(URL + "3"):
+            pass
+        assert list(cache.entries) == ["1", "3"]
+        assert not os.path.exists(self.path("2"))
+        assert os.path.exists(self.path("1"))
+
+
+    def test_video_in_use_is_kept(self):
+        """
+        TODO
+        """
+        cache = StandInCache(self.directory.name, budget=15)
+        with cache.open(URL + "1") as filename:
+            with cache.open(URL + "2"):
+                pass
+            assert os.path.exists(filename)
+            assert list(cache.entries) == ["1"]
+
+        # Once the video is released the cache is brought back within its budget
+        cache.prefetch(URL + "3")
+        with cache.open(URL + "3"):
+            pass
+        assert list(cache.entries) == ["3"]
+        assert not os.path.exists(self.path("1"))
+
+
+    def test_clear(self):
+        """
+        TODO
+        """
+        cache = StandInCache(self.directory.name, budget=100)
+        cache.prefetch(URL + "1")
+        with cache.open(URL + "2"):
+            pass
+        cache.clear()
+        cache.executor.shutdown(wait=True)
+        assert not cache.entries
+        assert not os.listdir(self.directory.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
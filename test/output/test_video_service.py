@@ -0,0 +1,147 @@
+"""
+TODO
+"""
+
+import io
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+from src.output import video_service
+from src.output.token_manager import TokenManager
+from src.output.video_service import VideoService, get_service_did
+
+BLOB : Dict[str, Any] = {"$type": "blob", "ref": {"$link": "bafk"}, "mimeType": "video/mp4"}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    A stand-in for the Bluesky API and video service.
+    """
+
+    calls   : List[str] = []
+    uploads : List[int] = []
+    pending : int       = 2
+    state   : str       = video_service.JOB_COMPLETED
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Respond to service token and job status requests.
+        """
+        url      = urlparse(self.path)
+        endpoint = url.path.rsplit("/", 1)[-1]
+        StandInHandler.calls.append(endpoint)
+        if endpoint == "com.atproto.server.getServiceAuth":
+            query = parse_qs(url.query)
+            assert query["lxm"] == ["com.atproto.repo.uploadBlob"]
+            self.respond(200, {"token": "service-token"})
+        elif endpoint == "app.bsky.video.getJobStatus":
+            if StandInHandler.pending > 0:
+                StandInHandler.pending -= 1
+                self.respond(200, {"jobStatus": {"jobId": "job", "state": "JOB_STATE_ENCODING"}})
+            else:
+                self.respond(200, {"jobStatus": {"jobId": "job",
+                                                 "state": StandInHandler.state,
+                                                 "blob": BLOB}})
+        else:
+            self.respond(404, {})
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """
+        Respond to session and upload requests.
+        """
+        endpoint = urlparse(self.path).path.rsplit("/", 1)[-1]
+        StandInHandler.calls.append(endpoint)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if endpoint == "com.atproto.server.createSession":
+            self.respond(200, {"did": "did:plc:bot", "accessJwt": "a.e30.c", "refreshJwt": "r"})
+        elif endpoint == "app.bsky.video.uploadVideo":
+            assert self.headers.get("Authorization") == "Bearer service-token"
+            StandInHandler.uploads.append(len(body))
+            self.respond(200, {"jobId": "job", "state": "JOB_STATE_CREATED"})
+        else:
+            self.respond(404, {})
+
+    def respond(self, status, body):
+        """
+        Send the given JSON response.
+        """
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *_args):
+        """
+        Silence request logging.
+        """
+
+
+class TestVideoService(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def setUp(self):
+        StandInHandler.calls   = []
+        StandInHandler.uploads = []
+        StandInHandler.pending = 2
+        StandInHandler.state   = video_service.JOB_COMPLETED
+        self.poll_initial = video_service.POLL_INITIAL
+        video_service.POLL_INITIAL = 0.01
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        base_url    = "http://127.0.0.1:" + str(self.server.server_port) + "/"
+        self.videos = VideoService(TokenManager("handle", "password", base_url), base_url)
+
+    def tearDown(self):
+        video_service.POLL_INITIAL = self.poll_initial
+        self.server.shutdown()
+        self.server.server_close()
+
+
+    def test_service_did(self):
+        """
+        TODO
+        """
+        session = {"didDoc": {"service": [{"id": "#atproto_pds",
+                                           "serviceEndpoint": "https://pds.host.bsky.network"}]}}
+        assert get_service_did(session, "https://bsky.social/xrpc/") == \
+            "did:web:pds.host.bsky.network"
+        assert get_service_did({}, "https://bsky.social/xrpc/") == "did:web:bsky.social"
+
+
+    def test_upload_waits_for_processing(self):
+        """
+        TODO
+        """
+        data = b"video" * 10000
+        blob = self.videos.upload(io.BytesIO(data), len(data), "highlight.mp4")
+        assert blob == BLOB
+        assert StandInHandler.uploads == [len(data)]
+        assert StandInHandler.calls.count("app.bsky.video.uploadVideo") == 1
+        assert StandInHandler.calls.count("app.bsky.video.getJobStatus") == 3
+
+
+    def test_processing_failure(self):
+        """
+        TODO
+        """
+        StandInHandler.state = video_service.JOB_FAILED
+        assert self.videos.wait("job") is None
+
+
+    def test_processing_timeout(self):
+        """
+        TODO
+        """
+        StandInHandler.pending = 1000
+        self.videos.timeout    = 0.1
+        assert self.videos.wait("job") is None
+        assert StandInHandler.calls.count("app.bsky.video.getJobStatus") > 1
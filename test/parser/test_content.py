@@ -0,0 +1,160 @@
+"""
+TODO
+"""
+
+import unittest
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+from src.game_data_registry import GameDataRegistry
+from src.parser import content
+from src.data.game_type import GameType
+from src.data.period import Period
+from src.parser.content import ContentParser
+
+SCORING : List[Any] = [{"periodDescriptor": {"number": 1, "periodType": "REG"},
+                        "goals": [{"highlightClip": 1}]}]
+
+
+class StandInParser(ContentParser):
+    """
+    A content parser that returns the given documents instead of fetching them, and records the
+    goals it parses instead of posting them.
+    """
+
+    def __init__(self, documents : List[Any]) -> None:
+        super().__init__(2024020001, datetime.now(timezone.utc))
+        self.documents : List[Any] = documents
+        self.goals     : List[Any] = []
+        self.failures  : int       = 0
+
+
+    def get_data(self) -> None:
+        document : Any = self.documents.pop(0)
+        self.changed = document is not self.data
+        self.data    = document
+
+
+    def parse_goal(self, game_data, period, descriptor, goal) -> None:
+        if self.failures > 0:
+            self.failures -= 1
+            raise OSError("journal write failed")
+        self.goals.append(goal)
+
+
+def get_document(clock : str, scoring : List[Any]) -> Any:
+    """
+    Return a landing document with the given game clock and scoring summary.
+    """
+    return {"gameType": 2, "clock": clock, "summary": {"scoring": scoring}}
+
+
+class TestContentParser(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def setUp(self) -> None:
+        self.game_data : List[Optional[str]] = ["game-data"]
+        self.registry = content.game_data_registry
+        content.game_data_registry = GameDataRegistry(lambda _: self.game_data.pop(0))
+
+
+    def tearDown(self) -> None:
+        content.game_data_registry = self.registry
+
+
+    def test_unchanged_document(self):
+        """
+        TODO
+        """
+        document = get_document("10:00", SCORING)
+        parser   = StandInParser([document, document])
+        parser.parse()
+        assert parser.changed
+        assert len(parser.goals) == 1
+
+        parser.parse()
+        assert not parser.changed
+        assert len(parser.goals) == 1
+
+
+    def test_unchanged_scoring(self):
+        """
+        TODO
+        """
+        parser = StandInParser([get_document("10:00", SCORING), get_document("09:55", SCORING)])
+        parser.parse()
+        parser.parse()
+        assert not parser.changed
+        assert len(parser.goals) == 1
+
+
+    def test_changed_scoring(self):
+        """
+        TODO
+        """
+        scoring = [dict(SCORING[0], goals=[{"highlightClip": 1}, {"highlightClip": 2}])]
+        parser  = StandInParser([get_document("10:00", SCORING), get_document("09:55", scoring)])
+        parser.parse()
+        parser.parse()
+        assert parser.changed
+        assert len(parser.goals) == 3
+
+
+    def test_pending_until_processed(self):
+        """
+        TODO
+        """
+        self.game_data = [None, "game-data"]
+        document = get_document("10:00", SCORING)
+        parser   = StandInParser([document, document, document])
+        parser.parse()
+        assert not parser.changed
+        assert not parser.goals
+
+        # The document hasn't changed, but its scoring summary was never processed
+        parser.parse()
+        assert parser.changed
+        assert len(parser.goals) == 1
+
+        parser.parse()
+        assert not parser.changed
+        assert len(parser.goals) == 1
+
+
+    def test_failed_goal_is_retried(self):
+        """
+        TODO
+        """
+        document = get_document("10:00", SCORING)
+        parser   = StandInParser([document, document, document])
+        parser.failures = 1
+        with self.assertRaises(OSError):
+            parser.parse()
+
+        # The document hasn't changed, but the goal that failed is parsed again
+        parser.parse()
+        assert len(parser.goals) == 1
+
+        parser.parse()
+        assert not parser.changed
+        assert len(parser.goals) == 1
+
+
+    def test_fingerprint_is_kept_for_failed_goal(self):
+        """
+        TODO
+        """
+        parser     = ContentParser(2024020001, datetime.now(timezone.utc))
+        descriptor = SCORING[0]["periodDescriptor"]
+        period     = Period(GameType.REGULAR_SEASON, descriptor)
+
+        # The goal stub doesn't have a score yet, so the highlight can't be built
+        with self.assertRaises(KeyError):
+            parser.parse_goal("game-data", period, descriptor, {"highlightClip": 1})
+        assert not parser.highlight_list.fingerprints
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+TODO
+"""
+
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List
+
+from src.parser.parser import Parser, requests_in_flight
+from src.parser.response_cache import response_cache
+
+BODY : bytes = json.dumps({
+    "gameState": "LIVE",
+    "summary": {"scoring": []},
+    "padding": "x" * 64
+}).encode()
+ETAG : str   = '"abc123"'
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    A stand-in for the NHL API that supports conditional requests.
+    """
+
+    requests : List[Any] = []
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Respond with the document, or 304 if the client's validator matches.
+        """
+        StandInHandler.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *_args):
+        """
+        Silence request logging.
+        """
+
+
+class StandInParser(Parser):
+    """
+    TODO
+    """
+
+    def parse(self):
+        """
+        TODO
+        """
+        self.get_data()
+        return self.data
+
+
+class TestParser(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def setUp(self):
+        StandInHandler.requests = []
+        response_cache.clear()
+        self.window = requests_in_flight.window
+        requests_in_flight.window = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = "http://127.0.0.1:" + str(self.server.server_port) + "/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        response_cache.clear()
+        requests_in_flight.window = self.window
+
+    def test_not_modified(self):
+        """
+        TODO
+        """
+        parser = StandInParser(1, "/landing", self.base_url)
+        parser.ttl = 0
+        first  = parser.parse()
+        assert first["gameState"] == "LIVE"
+        assert parser.changed
+
+        second = parser.parse()
+        assert second is first
+        assert not parser.changed
+        assert StandInHandler.requests[0].get("If-None-Match") is None
+        assert StandInHandler.requests[1].get("If-None-Match") == ETAG
+
+    def test_shared_validators(self):
+        """
+        TODO
+        """
+        StandInParser(1, "/landing", self.base_url).parse()
+        parser = StandInParser(1, "/landing", self.base_url)
+        parser.ttl = 0
+        data   = parser.parse()
+        assert data["gameState"] == "LIVE"
+        assert StandInHandler.requests[1].get("If-None-Match") == ETAG
+
+    def test_fresh_response_is_cached(self):
+        """
+        TODO
+        """
+        StandInParser(1, "/landing", self.base_url).parse()
+        data = StandInParser(1, "/landing", self.base_url).parse()
+        assert data["gameState"] == "LIVE"
+        assert len(StandInHandler.requests) == 1
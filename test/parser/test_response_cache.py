@@ -0,0 +1,79 @@
+"""
+TODO
+"""
+
+import time
+import unittest
+
+from src.metrics import registry
+from src.parser.response_cache import Document, ResponseCache, register_metrics
+
+class TestResponseCache(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def test_fresh_document_is_a_hit(self):
+        """
+        TODO
+        """
+        cache = ResponseCache()
+        cache.put("url", Document({"a": 1}, "digest", size=10))
+        document = cache.get("url", 60)
+        assert document is not None
+        assert document.data == {"a": 1}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 0
+
+
+    def test_stale_document_is_a_miss(self):
+        """
+        TODO
+        """
+        cache = ResponseCache()
+        cache.put("url", Document({"a": 1}, "digest", size=10,
+                                  fetched_at=time.monotonic() - 10))
+        assert cache.get("url", 5) is None
+        assert cache.lookup("url") is not None
+        assert cache.stats()["misses"] == 1
+
+
+    def test_least_recently_used_is_evicted(self):
+        """
+        TODO
+        """
+        cache = ResponseCache(max_bytes=25)
+        cache.put("first", Document(1, "a", size=10))
+        cache.put("second", Document(2, "b", size=10))
+        cache.get("first", 60)
+        cache.put("third", Document(3, "c", size=10))
+        assert cache.lookup("first") is not None
+        assert cache.lookup("second") is None
+        assert cache.lookup("third") is not None
+        assert cache.stats()["bytes"] == 20
+
+
+    def test_replace_updates_size(self):
+        """
+        TODO
+        """
+        cache = ResponseCache()
+        cache.put("url", Document(1, "a", size=10))
+        cache.put("url", Document(2, "b", size=4))
+        assert cache.stats()["bytes"] == 4
+        assert cache.stats()["documents"] == 1
+
+
+    def test_metrics(self):
+        """
+        TODO
+        """
+        cache = ResponseCache()
+        register_metrics(cache)
+        cache.put("a", Document({}, "digest", size=10))
+        cache.get("a", 60)
+        cache.get("b", 60)
+        text = registry.render()
+        assert 'response_cache_requests_total{result="hit"} 1' in text
+        assert 'response_cache_requests_total{result="miss"} 1' in text
+        assert 'response_cache_size{unit="bytes"} 10' in text
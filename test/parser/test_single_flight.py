@@ -0,0 +1,68 @@
+"""
+TODO
+"""
+
+import threading
+import time
+import unittest
+from typing import List, Optional
+
+from src.parser.single_flight import SingleFlight
+
+class TestSingleFlight(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def test_concurrent_calls_are_shared(self):
+        """
+        TODO
+        """
+        single_flight : SingleFlight[int] = SingleFlight(window=0)
+        calls   : List[int]           = []
+        results : List[Optional[int]] = []
+
+        def fetch() -> int:
+            calls.append(1)
+            time.sleep(0.2)
+            return 42
+
+        def caller() -> None:
+            results.append(single_flight.do("url", fetch))
+
+        threads = [threading.Thread(target=caller) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [42] * 5
+
+
+    def test_fresh_result_is_reused(self):
+        """
+        TODO
+        """
+        single_flight : SingleFlight[int] = SingleFlight(window=60)
+        assert single_flight.do("url", lambda: 1) == 1
+        assert single_flight.do("url", lambda: 2) == 1
+        assert single_flight.do("other", lambda: 3) == 3
+
+
+    def test_stale_result_is_refetched(self):
+        """
+        TODO
+        """
+        single_flight : SingleFlight[int] = SingleFlight(window=0)
+        assert single_flight.do("url", lambda: 1) == 1
+        assert single_flight.do("url", lambda: 2) == 2
+
+
+    def test_failure_is_not_reused(self):
+        """
+        TODO
+        """
+        single_flight : SingleFlight[int] = SingleFlight(window=60)
+        assert single_flight.do("url", lambda: None) is None
+        assert single_flight.do("url", lambda: 2) == 2
@@ -0,0 +1,50 @@
+"""
+TODO
+"""
+
+import asyncio
+import unittest
+
+from src import bot
+
+
+class StandInTracker:
+    """
+    A tracker that polls a number of times, or fails after a delay.
+    """
+
+    def __init__(self, polls : int, fails : bool = False) -> None:
+        self.polls  : int  = polls
+        self.fails  : bool = fails
+        self.polled : int  = 0
+
+
+    async def run(self) -> None:
+        """
+        Poll until finished, raising an error if this tracker fails.
+        """
+        if self.fails:
+            await asyncio.sleep(0.1)
+            raise KeyError("gameState")
+        while self.polled < self.polls:
+            self.polled += 1
+            await asyncio.sleep(0.05)
+
+
+class TestBot(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def test_failed_tracker(self):
+        """
+        TODO
+        """
+        healthy = StandInTracker(10)
+        failing = StandInTracker(10, fails=True)
+        bot.run_trackers([failing, healthy])  # type: ignore[list-item]
+        assert healthy.polled == 10
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+TODO
+"""
+
+import threading
+import time
+import unittest
+from typing import Any, List, Optional
+
+from src.game_data_registry import GameDataRegistry
+
+
+class StandInFetch:
+    """
+    A fetch that returns a placeholder for each game, failing the first time if asked to.
+    """
+
+    def __init__(self, failures : int = 0, delay : float = 0) -> None:
+        self.failures : int       = failures
+        self.delay    : float     = delay
+        self.calls    : List[int] = []
+
+
+    def __call__(self, game_id : int) -> Optional[Any]:
+        self.calls.append(game_id)
+        if game_id == 1:
+            time.sleep(self.delay)
+        if self.failures > 0:
+            self.failures -= 1
+            return None
+        return "game-" + str(game_id)
+
+
+class TestGameDataRegistry(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def test_fetch_once(self):
+        """
+        TODO
+        """
+        fetch    = StandInFetch(delay=0.2)
+        registry = GameDataRegistry(fetch)
+        results : List[Optional[Any]] = []
+
+        threads = [threading.Thread(target=lambda: results.append(registry.get(1)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["game-1"] * 4
+        assert registry.get(1) == "game-1"
+        assert fetch.calls == [1]
+
+
+    def test_failure_is_not_stored(self):
+        """
+        TODO
+        """
+        fetch    = StandInFetch(failures=1)
+        registry = GameDataRegistry(fetch)
+        assert registry.get(2) is None
+        assert registry.get(2) == "game-2"
+        assert fetch.calls == [2, 2]
+
+
+    def test_slow_fetch_does_not_block_other_games(self):
+        """
+        TODO
+        """
+        fetch    = StandInFetch(delay=1)
+        registry = GameDataRegistry(fetch)
+        thread   = threading.Thread(target=registry.get, args=(1,))
+        thread.start()
+        time.sleep(0.1)
+
+        started : float = time.monotonic()
+        assert registry.get(2) == "game-2"
+        assert time.monotonic() - started < 0.5
+        thread.join()
+
+
+    def test_clear(self):
+        """
+        TODO
+        """
+        fetch    = StandInFetch()
+        registry = GameDataRegistry(fetch)
+        registry.get(2)
+        registry.clear()
+        assert registry.get(2) == "game-2"
+        assert fetch.calls == [2, 2]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+TODO
+"""
+
+import asyncio
+import unittest
+
+from src import game_tracker
+from src.game_tracker import FetchPool, GameTracker
+
+
+class StandInParser:  # pylint: disable=too-few-public-methods
+    """
+    A parser that fails the first time it is called.
+    """
+
+    def __init__(self) -> None:
+        self.calls : int = 0
+
+
+    def parse(self) -> None:
+        """
+        Count the call, raising an error the first time.
+        """
+        self.calls += 1
+        if self.calls == 1:
+            raise KeyError("plays")
+
+
+class TestGameTracker(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def test_failed_parse(self):
+        """
+        TODO
+        """
+        interval = game_tracker.POLL_INTERVAL
+        game_tracker.POLL_INTERVAL = 0
+        try:
+            tracker = GameTracker.__new__(GameTracker)
+            tracker.game_id = 2024020001
+            tracker.parser  = StandInParser()  # type: ignore[assignment]
+            asyncio.run(tracker.poll())
+            asyncio.run(tracker.poll())
+            assert tracker.parser.calls == 2
+        finally:
+            game_tracker.POLL_INTERVAL = interval
+
+
+    def test_fetch_pool_size(self):
+        """
+        TODO
+        """
+        pool = FetchPool()
+        pool.resize(1)
+        assert pool.workers == game_tracker.MIN_FETCH_WORKERS
+        pool.resize(10)
+        assert pool.workers == 10 * game_tracker.FETCH_WORKERS_PER_GAME
+        pool.resize(1000)
+        assert pool.workers == game_tracker.MAX_FETCH_WORKERS
+        pool.executor.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
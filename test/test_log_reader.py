@@ -0,0 +1,88 @@
+"""
+TODO
+"""
+
+import os
+import tempfile
+import unittest
+
+from src.log_reader import read_lines_reversed, tail
+
+LINES = [
+    "2024-10-09 19:00:00 | INFO | Game 2024020001: The game is live.",
+    "2024-10-09 19:00:05 | INFO | Game 2024020002: The game is live.",
+    "2024-10-09 19:10:00 | ERROR | Game data is null for game: 2024020001",
+    "2024-10-09 19:20:00 | WARNING | Bluesky - Skipping duplicate post",
+    "2024-10-09 19:30:00 | INFO | Adding highlight to list: 6363688917112",
+]
+
+
+class TestLogReader(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with
+        self.path      = os.path.join(self.directory.name, "bot.log")
+        with open(self.path, "w", encoding="utf-8") as log_file:
+            log_file.write("\n".join(LINES) + "\n")
+
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+    def test_read_lines_reversed(self):
+        """
+        TODO
+        """
+        for block_size in (1, 7, 64, 4096):
+            lines = list(read_lines_reversed(self.path, block_size=block_size))
+            assert lines == list(reversed(LINES))
+
+
+    def test_scan_limit(self):
+        """
+        TODO
+        """
+        lines = list(read_lines_reversed(self.path, block_size=16, limit=len(LINES[-1]) + 1))
+        assert lines == [LINES[-1]]
+
+
+    def test_tail(self):
+        """
+        TODO
+        """
+        assert tail(self.path, lines=2) == LINES[-2:]
+        assert tail(self.path, lines=100) == LINES
+
+
+    def test_tail_offset(self):
+        """
+        TODO
+        """
+        assert tail(self.path, lines=2, offset=2) == LINES[1:3]
+        assert not tail(self.path, lines=2, offset=10)
+
+
+    def test_tail_level(self):
+        """
+        TODO
+        """
+        assert tail(self.path, level="warning") == LINES[2:4]
+        assert tail(self.path, level="error") == [LINES[2]]
+
+
+    def test_tail_game(self):
+        """
+        TODO
+        """
+        assert tail(self.path, game="2024020001") == [LINES[0], LINES[2]]
+
+
+    def test_missing_file(self):
+        """
+        TODO
+        """
+        assert not tail(os.path.join(self.directory.name, "missing.log"))
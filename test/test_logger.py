@@ -0,0 +1,156 @@
+"""
+TODO
+"""
+
+import logging
+import os
+import tempfile
+import unittest
+from typing import List
+
+from src import logger
+from src.logger import BroadcastHandler, Logger
+
+
+def make_record(message : str) -> logging.LogRecord:
+    """
+    Return a log record with the given message.
+    """
+    return logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+
+
+class TestBroadcastHandler(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def test_backlog(self):
+        """
+        TODO
+        """
+        handler = BroadcastHandler()
+        handler.handle(make_record("first"))
+        handler.handle(make_record("second"))
+        subscription = handler.subscribe()
+        assert subscription is not None
+        assert subscription.backlog == ["first", "second"]
+        assert subscription.get(0) is None
+
+
+    def test_subscriber_receives_lines(self):
+        """
+        TODO
+        """
+        handler      = BroadcastHandler()
+        subscription = handler.subscribe()
+        assert subscription is not None
+        handler.handle(make_record("live"))
+        assert subscription.get(0) == "live"
+
+        handler.unsubscribe(subscription)
+        handler.handle(make_record("after"))
+        assert subscription.get(0) is None
+
+
+    def test_ring_buffer_is_bounded(self):
+        """
+        TODO
+        """
+        handler = BroadcastHandler()
+        for index in range(logger.RING_SIZE + 10):
+            handler.handle(make_record(str(index)))
+        subscription = handler.subscribe()
+        assert subscription is not None
+        assert len(subscription.backlog) == logger.RING_SIZE
+        assert subscription.backlog[0] == "10"
+
+
+    def test_slow_subscriber_drops_lines(self):
+        """
+        TODO
+        """
+        handler      = BroadcastHandler()
+        subscription = handler.subscribe()
+        assert subscription is not None
+        for index in range(logger.SUBSCRIBER_QUEUE_SIZE + 5):
+            handler.handle(make_record(str(index)))
+        assert subscription.dropped == 5
+        assert subscription.lines.qsize() == logger.SUBSCRIBER_QUEUE_SIZE
+
+
+    def test_subscriber_limit(self):
+        """
+        TODO
+        """
+        handler = BroadcastHandler()
+        for _ in range(logger.MAX_SUBSCRIBERS):
+            assert handler.subscribe() is not None
+        assert handler.subscribe() is None
+
+
+def read_messages(path : str) -> List[str]:
+    """
+    Return the message of each line in the given log file.
+    """
+    with open(path, encoding="utf-8") as log_file:
+        return [line.rstrip("\n").split(" | ", 2)[2] for line in log_file]
+
+
+class TestLogger(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.path      = os.path.join(self.directory.name, "test.log")
+        self.log       = Logger(self.path, "test-" + self.id())
+
+
+    def tearDown(self) -> None:
+        self.log.stop()
+        self.log.file_handler.close()
+        self.directory.cleanup()
+
+
+    def test_records_reach_handlers(self):
+        """
+        TODO
+        """
+        subscription = self.log.subscribe()
+        assert subscription is not None
+        self.log.info("first")
+        self.log.verbose("hidden")
+        self.log.error("second")
+        assert subscription.get(5).endswith("INFO | first")
+        assert subscription.get(5).endswith("ERROR | second")
+        self.log.stop()
+        assert read_messages(self.path) == ["first", "second"]
+
+
+    def test_flush_keeps_queued_records(self):
+        """
+        TODO
+        """
+        for index in range(500):
+            self.log.info(str(index))
+        self.log.flush()
+        self.log.info("after")
+        self.log.stop()
+        assert read_messages(self.path + ".1") == [str(index) for index in range(500)]
+        assert read_messages(self.path) == ["after"]
+
+
+    def test_stop_drains_queue(self):
+        """
+        TODO
+        """
+        for index in range(1000):
+            self.log.info(str(index))
+        self.log.stop()
+        assert len(read_messages(self.path)) == 1000
+
+        # Records logged after the listener has stopped are not written
+        self.log.info("discarded")
+        self.log.stop()
+        assert len(read_messages(self.path)) == 1000
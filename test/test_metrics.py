@@ -0,0 +1,118 @@
+"""
+TODO
+"""
+
+import threading
+import unittest
+
+from src.metrics import Callback, Counter, Gauge, Histogram, Registry
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    TODO
+    """
+
+    def test_counter(self):
+        """
+        TODO
+        """
+        counter = Counter()
+        counter.inc("Post Reply")
+        counter.inc("Post Reply")
+        counter.inc("Post Highlight", 3)
+        assert counter.snapshot() == {"Post Reply": 2, "Post Highlight": 3}
+
+
+    def test_histogram(self):
+        """
+        TODO
+        """
+        histogram = Histogram(buckets=(1, 10))
+        histogram.observe("Post Highlight", 0.5)
+        histogram.observe("Post Highlight", 5)
+        histogram.observe("Post Highlight", 50)
+        summary = histogram.snapshot()["Post Highlight"]
+        assert summary["count"] == 3
+        assert summary["sum"] == 55.5
+        assert summary["max"] == 50
+        assert summary["buckets"] == {"1": 1, "10": 2, "inf": 3}
+
+
+    def test_empty_histogram(self):
+        """
+        TODO
+        """
+        assert not Histogram().snapshot()
+
+
+    def test_counter_across_threads(self):
+        """
+        TODO
+        """
+        counter = Counter()
+        def count():
+            for _ in range(1000):
+                counter.inc("poll")
+        threads = [threading.Thread(target=count) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert counter.snapshot() == {"poll": 4000}
+
+
+    def test_gauge(self):
+        """
+        TODO
+        """
+        gauge = Gauge()
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        assert gauge.snapshot() == {"": 1}
+
+
+    def test_render(self):
+        """
+        TODO
+        """
+        registry = Registry()
+        counter  = registry.register(Counter("requests_total", "Requests made.", "endpoint"))
+        latency  = registry.register(Histogram("latency_seconds", "Latency.", buckets=(0.5,)))
+        registry.register(Callback("depth", "Queue depth.", "priority", lambda: {"POST": 2}))
+        counter.inc("/landing")
+        latency.observe("", 0.25)
+        latency.observe("", 1.5)
+        lines = registry.render().splitlines()
+        assert "# TYPE requests_total counter" in lines
+        assert 'requests_total{endpoint="/landing"} 1' in lines
+        assert "# TYPE latency_seconds histogram" in lines
+        assert 'latency_seconds_bucket{le="0.5"} 1' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 2' in lines
+        assert "latency_seconds_sum 1.75" in lines
+        assert "latency_seconds_count 2" in lines
+        assert 'depth{priority="POST"} 2' in lines
+
+
+    def test_several_labels(self):
+        """
+        TODO
+        """
+        counter = Counter("posts_sent_total", "Posts sent.", ("outputter", "kind"))
+        counter.inc(("Bluesky", "post"))
+        counter.inc(("Bluesky", "reply"))
+        counter.inc(("Bluesky", "reply"))
+        lines = counter.render()
+        assert 'posts_sent_total{outputter="Bluesky",kind="post"} 1' in lines
+        assert 'posts_sent_total{outputter="Bluesky",kind="reply"} 2' in lines
+
+
+    def test_label_escaping(self):
+        """
+        TODO
+        """
+        registry = Registry()
+        counter  = registry.register(Counter("posts_total", "Posts.", "text"))
+        counter.inc('say "hi"')
+        assert 'posts_total{text="say \\"hi\\""} 1' in registry.render().splitlines()